@@ -0,0 +1,49 @@
+# bench_chart_rendering.py
+# Per-slide write_image calls vs. one batch through ChartRenderer for a 10-chart deck.
+# Requires kaleido and a Chrome install (`plotly_get_chrome`).
+#
+#   python benchmarks/bench_chart_rendering.py
+import time
+
+from sample_data import sample_pitch_data
+from chart_renderer import ChartRenderer
+from main_generator import PitchDeckGenerator
+
+CHART_COUNT = 10
+
+
+def ten_chart_deck():
+    generator = PitchDeckGenerator()
+    figs = []
+    while len(figs) < CHART_COUNT:
+        figs.extend(generator._build_charts(sample_pitch_data()).values())
+    return figs[:CHART_COUNT]
+
+
+def bench_per_slide(figs) -> float:
+    start = time.perf_counter()
+    for fig in figs:
+        fig.to_image(format="png")
+    return time.perf_counter() - start
+
+
+def bench_batched(figs) -> float:
+    renderer = ChartRenderer()
+    start = time.perf_counter()
+    images = renderer.render_many(figs)
+    elapsed = time.perf_counter() - start
+    renderer.shutdown()
+    assert all(image.startswith(b"\x89PNG") for image in images)
+    return elapsed
+
+
+def main():
+    figs = ten_chart_deck()
+    per_slide = bench_per_slide(figs)
+    batched = bench_batched(figs)
+    print(f"{CHART_COUNT} charts, per-slide: {per_slide:.2f}s")
+    print(f"{CHART_COUNT} charts, batched:   {batched:.2f}s ({per_slide / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_concurrent_llm.py
+# Compares sequential vs. fanned-out LLM generation against a local stub model.
+#
+#   python benchmarks/bench_concurrent_llm.py
+import time
+
+from sample_data import sample_pitch_data
+from ai_content_generator import AIContentGenerator
+from main_generator import PitchDeckGenerator
+
+PITCH_LATENCY = 0.6
+SUMMARY_LATENCY = 1.0
+
+
+class StubContentGenerator(AIContentGenerator):
+    # Sleeps instead of calling Gemini; the executive summary prompt is the slower one
+    def _run_prompt(self, prompt) -> str:
+        latency = SUMMARY_LATENCY if prompt.name == "executive_summary" else PITCH_LATENCY
+        time.sleep(latency)
+        return "stub response"
+
+
+def bench_sequential(generator: PitchDeckGenerator, pitch_data) -> float:
+    start = time.perf_counter()
+    generator.content_generator.generate_elevator_pitch(pitch_data)
+    generator.content_generator.generate_executive_summary(pitch_data)
+    generator._build_charts(pitch_data)
+    return time.perf_counter() - start
+
+
+def bench_concurrent(generator: PitchDeckGenerator, pitch_data) -> float:
+    start = time.perf_counter()
+    pitch_future = generator.content_generator.submit_elevator_pitch(pitch_data)
+    summary_future = generator.content_generator.submit_executive_summary(pitch_data)
+    generator._build_charts(pitch_data)
+    pitch_future.result()
+    summary_future.result()
+    return time.perf_counter() - start
+
+
+def main():
+    pitch_data = sample_pitch_data()
+    generator = PitchDeckGenerator()
+    generator.content_generator = StubContentGenerator()
+    # Warm up plotly/pandas imports so they don't skew the first run
+    generator._build_charts(pitch_data)
+
+    sequential = bench_sequential(generator, pitch_data)
+    concurrent = bench_concurrent(generator, pitch_data)
+
+    print(f"stub latencies:  pitch={PITCH_LATENCY:.2f}s summary={SUMMARY_LATENCY:.2f}s")
+    print(f"sum of calls:    {PITCH_LATENCY + SUMMARY_LATENCY:.2f}s")
+    print(f"sequential:      {sequential:.2f}s")
+    print(f"concurrent:      {concurrent:.2f}s (slowest call {max(PITCH_LATENCY, SUMMARY_LATENCY):.2f}s)")
+    generator.content_generator.shutdown()
+
+
+if __name__ == "__main__":
+    main()
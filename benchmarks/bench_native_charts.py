@@ -0,0 +1,57 @@
+# bench_native_charts.py
+# Deck build time and output size with rasterized vs. native PowerPoint charts.
+#
+#   python benchmarks/bench_native_charts.py --iterations 5
+#
+# Without Chrome for kaleido the image mode falls back to a fixed PNG, which
+# understates both its build time and its file size.
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from stub_model import install_stub_model
+from run_benchmarks import kaleido_available, pitch_data_for_size, uncached_renderer, use_stub_rasterizer
+from ai_content_generator import AIContentGenerator
+from main_generator import PitchDeckGenerator
+from projections import ScenarioConfig
+
+
+def bench_mode(mode: str, pitch_data, iterations: int):
+    generator = PitchDeckGenerator(content_generator=AIContentGenerator(use_cache=False),
+                                   scenarios=ScenarioConfig(), chart_mode=mode)
+    generator.chart_renderer = uncached_renderer()
+    samples, deck = [], b""
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_pitch_deck(pitch_data, as_bytes=True)  # warm-up
+        for _ in range(iterations):
+            # Start cold every time; otherwise every prompt, figure and render is a memo hit
+            generator.build_graph.clear()
+            start = time.perf_counter()
+            deck = generator.generate_pitch_deck(pitch_data, as_bytes=True)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples), len(deck)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Image vs. native chart decks")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--size", default="typical", choices=["small", "typical", "large"])
+    args = parser.parse_args(argv)
+
+    install_stub_model()
+    rasterizer = "kaleido" if kaleido_available() else "stub"
+    if rasterizer == "stub":
+        use_stub_rasterizer()
+
+    pitch_data = pitch_data_for_size(args.size)
+    print(f"rasterizer: {rasterizer}, size: {args.size}")
+    print(f"{'mode':<8}{'p50 ms':>10}{'deck KB':>10}")
+    for mode in ("image", "native"):
+        p50, size = bench_mode(mode, pitch_data, args.iterations)
+        print(f"{mode:<8}{p50 * 1000:>10.1f}{size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
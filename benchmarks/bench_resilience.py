@@ -0,0 +1,100 @@
+# bench_resilience.py
+# Drives AIContentGenerator through the LLM scheduler against the stub model
+# with injected latency, a slow tail and transient failures.
+#
+#   python benchmarks/bench_resilience.py --calls 200
+#
+# Scenarios: a flaky backend with and without hedging, a hung backend (deadline)
+# and an outage (circuit breaker).
+import argparse
+import contextlib
+import io
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stub_model import install_stub_model
+from sample_data import sample_pitch_data
+from ai_content_generator import AIContentGenerator
+from llm_scheduler import CircuitBreaker, LLMCallError, LLMScheduler
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run_calls(scheduler: LLMScheduler, calls: int, concurrency: int):
+    generator = AIContentGenerator(use_cache=False, scheduler=scheduler)
+    pitch_data = sample_pitch_data()
+
+    def one_call(_):
+        start = time.perf_counter()
+        try:
+            generator.generate_elevator_pitch(pitch_data)
+            return time.perf_counter() - start, None
+        except LLMCallError as e:
+            return time.perf_counter() - start, type(e).__name__
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one_call, range(calls)))
+    generator.shutdown()
+    return results
+
+
+def report(label: str, scheduler: LLMScheduler, results):
+    latencies = [seconds for seconds, error in results if error is None]
+    errors = {}
+    for _, error in results:
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+    ok = f"{len(latencies)}/{len(results)}"
+    if latencies:
+        timings = (f"{statistics.median(latencies) * 1000:>8.0f}{percentile(latencies, 0.95) * 1000:>8.0f}"
+                   f"{percentile(latencies, 0.99) * 1000:>8.0f}")
+    else:
+        timings = f"{'-':>8}{'-':>8}{'-':>8}"
+    stats = scheduler.stats
+    print(f"{label:<16}{ok:>9}{timings}{stats.retries:>9}{stats.hedges:>8}{stats.hedge_wins:>6}"
+          f"{stats.timeouts:>10}{stats.short_circuits:>8}  {errors or ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM scheduler under injected faults")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    # camel logs every injected model error
+    logging.disable(logging.ERROR)
+
+    print(f"{'scenario':<16}{'ok':>9}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'retries':>9}"
+          f"{'hedges':>8}{'wins':>6}{'timeouts':>10}{'open':>8}")
+    for hedge in (False, True):
+        install_stub_model(latency=args.latency, failure_rate=args.failure_rate,
+                           slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+                           max_size=args.concurrency * 2, seed=args.seed)
+        scheduler = LLMScheduler(deadline=10, backoff_base=0.02, hedge=hedge,
+                                 breaker=CircuitBreaker(threshold=50))
+        report("flaky+hedge" if hedge else "flaky", scheduler,
+               run_calls(scheduler, args.calls, args.concurrency))
+
+    # Every call hangs past its deadline
+    install_stub_model(latency=5.0, max_size=args.concurrency * 2, seed=args.seed)
+    scheduler = LLMScheduler(deadline=0.3, max_retries=0, max_workers=args.concurrency * 2)
+    report("hung", scheduler, run_calls(scheduler, args.concurrency, args.concurrency))
+
+    # Hard outage: the breaker opens and later calls fail fast
+    install_stub_model(latency=args.latency, failure_rate=1.0, seed=args.seed)
+    scheduler = LLMScheduler(deadline=10, backoff_base=0.02, breaker=CircuitBreaker(threshold=5))
+    report("outage", scheduler, run_calls(scheduler, args.calls // 4, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# import_time.py
+# Cold-start import cost of the app modules, from `python -X importtime`.
+#
+#   python benchmarks/import_time.py                       # main_generator
+#   python benchmarks/import_time.py app --top 20
+#   python benchmarks/import_time.py --budget-ms 300       # exit 1 when over budget
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def import_times(module: str):
+    # Returns [(self_us, cumulative_us, depth, name)] for a fresh interpreter
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        error = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise SystemExit(f"import {module} failed:\n" + "\n".join(error[-5:]))
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cold import time")
+    parser.add_argument("module", nargs="?", default="main_generator")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float)
+    args = parser.parse_args(argv)
+
+    rows = import_times(args.module)
+    total_ms = next(cum for _, cum, _, name in reversed(rows) if name == args.module) / 1000
+
+    by_package = defaultdict(int)
+    for self_us, _, _, name in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import {args.module}: {total_ms:.1f} ms ({len(rows)} modules)")
+    print(f"\n{'top-level package':<32}{'self ms':>10}")
+    for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32}{us / 1000:>10.1f}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nOver budget: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
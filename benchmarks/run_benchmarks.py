@@ -0,0 +1,230 @@
+# run_benchmarks.py
+# Offline end-to-end and per-stage deck generation benchmarks.
+#
+#   python benchmarks/run_benchmarks.py                  # compare against baseline.json
+#   python benchmarks/run_benchmarks.py --save-baseline  # record a new baseline
+#   python benchmarks/run_benchmarks.py --sizes large --iterations 3 --llm-latency 0.2
+#
+# The LLM is replaced by stub_model.LatencyStubModel. Charts are rasterized with
+# kaleido when Chrome is available, otherwise with a fixed PNG so the suite still
+# runs anywhere (the report says which one was used).
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from stub_model import install_stub_model
+from sample_data import sample_record
+from models import PitchDeckData, SlideContent
+from validation import validate_pitch_data
+from ai_content_generator import AIContentGenerator
+from cache import LRUCache, TieredCache
+import chart_renderer
+from chart_renderer import ChartRenderer, apply_chart_layout
+from main_generator import PitchDeckGenerator
+from presentation_builder import PresentationBuilder
+from visualization_generator import VisualizationGenerator
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def pitch_data_for_size(size: str) -> PitchDeckData:
+    milestones, team, streams, text_repeat = {
+        "small": (3, 1, 2, 1),
+        "typical": (12, 5, 4, 3),
+        "large": (300, 40, 12, 20),
+    }[size]
+    data = sample_record(f"Bench {size.title()}")
+    start = date(2024, 1, 1)
+    data["roadmap"] = [
+        {"milestone": f"Milestone {i}",
+         "start_date": (start + timedelta(days=14 * i)).isoformat(),
+         "end_date": (start + timedelta(days=14 * i + 30)).isoformat()}
+        for i in range(milestones)
+    ]
+    data["team"] = [{"name": f"Member {i}", "role": "CEO" if i == 0 else f"Lead {i}"} for i in range(team)]
+    data["revenue_model"] = {f"Stream {i}": 100 / streams for i in range(streams)}
+    for name in ("problem_statement", "solution", "traction"):
+        data[name] = " ".join([data[name]] * text_repeat)
+    return validate_pitch_data(data)
+
+
+def uncached_renderer() -> ChartRenderer:
+    # Zero-entry cache: every benchmark iteration really rasterizes
+    return ChartRenderer(use_processes=False, cache=TieredCache(LRUCache(0)))
+
+
+def kaleido_available() -> bool:
+    try:
+        VisualizationGenerator().create_solution_diagram().to_image(format="png")
+        return True
+    except Exception:
+        return False
+
+
+def use_stub_rasterizer():
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), "white").save(buffer, "PNG")
+    png = buffer.getvalue()
+    chart_renderer._render_json = lambda fig_json, fmt: png
+    chart_renderer._init_worker = lambda: None
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def measure(fn, iterations: int):
+    # ru_maxrss is the process-wide high-water mark, so each benchmark reports how
+    # far it raised that peak (0 when it stayed under what earlier rows reached)
+    rss_before = max_rss_mb()
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    # Allocation profile from a separate pass so tracing doesn't skew timings
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "alloc_peak_kb": peak / 1024,
+        "live_blocks": blocks,
+        "rss_growth_mb": max_rss_mb() - rss_before,
+    }
+
+
+def stage_benchmarks(size: str, pitch_data: PitchDeckData):
+    content = AIContentGenerator(use_cache=False)
+    viz = VisualizationGenerator()
+    renderer = uncached_renderer()
+    market = {'TAM': pitch_data.market_size, 'SAM': pitch_data.market_size * 0.6,
+              'SOM': pitch_data.market_size * 0.3}
+
+    def add_chart():
+        builder = PresentationBuilder()
+        slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
+        chart = apply_chart_layout(viz.create_market_size_chart(market))
+        builder._add_chart(slide, {"chart": chart, "png": renderer.render(chart)}, 0, 0, 100)
+
+    def save():
+        builder = PresentationBuilder()
+        builder.add_title_slide(pitch_data.company_name, "Elevator pitch")
+        for i in range(10):
+            builder.add_content_slide(SlideContent(title=f"Slide {i}", content=pitch_data.solution))
+        builder.to_bytes()
+
+    generator = PitchDeckGenerator(content_generator=content)
+    generator.chart_renderer = renderer
+
+    def generate():
+        # Start cold every time; otherwise every prompt, figure and render is a memo hit
+        generator.build_graph.clear()
+        return generator.generate_pitch_deck(pitch_data, as_bytes=True)
+
+    return {
+        f"{size}/llm.elevator_pitch": lambda: content.generate_elevator_pitch(pitch_data),
+        f"{size}/llm.executive_summary": lambda: content.generate_executive_summary(pitch_data),
+        f"{size}/viz.create_market_size_chart": lambda: viz.create_market_size_chart(market),
+        f"{size}/viz.create_revenue_projection": lambda: viz.create_revenue_projection(pitch_data.revenue_model),
+        f"{size}/viz.create_roadmap_timeline": lambda: viz.create_roadmap_timeline(pitch_data.roadmap),
+        f"{size}/viz.create_solution_diagram": viz.create_solution_diagram,
+        f"{size}/viz.create_financial_forecast": viz.create_financial_forecast,
+        f"{size}/pptx.add_chart": add_chart,
+        f"{size}/pptx.save": save,
+        f"{size}/e2e.generate_pitch_deck": generate,
+    }
+
+
+def compare(results, baseline, threshold: float):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            result["vs_baseline"] = None
+            continue
+        delta = (result["p50_ms"] - base["p50_ms"]) / base["p50_ms"] if base["p50_ms"] else 0.0
+        result["vs_baseline"] = delta
+        if delta > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_report(results, rasterizer: str):
+    print(f"rasterizer: {rasterizer}")
+    print(f"{'benchmark':<42}{'p50 ms':>10}{'p95 ms':>10}{'alloc KB':>11}{'RSS +MB':>9}{'vs base':>9}")
+    for name, r in results.items():
+        delta = "" if r.get("vs_baseline") is None else f"{r['vs_baseline']:+.0%}"
+        print(f"{name:<42}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['alloc_peak_kb']:>11.0f}{r['rss_growth_mb']:>9.1f}{delta:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline pitch deck benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=["small", "typical", "large"],
+                        choices=["small", "typical", "large"])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="seconds added to every stub model call")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="p50 slowdown vs baseline reported as a regression")
+    args = parser.parse_args(argv)
+
+    install_stub_model(latency=args.llm_latency)
+    rasterizer = "kaleido" if kaleido_available() else "stub"
+    if rasterizer == "stub":
+        use_stub_rasterizer()
+
+    results = {}
+    for size in args.sizes:
+        for name, fn in stage_benchmarks(size, pitch_data_for_size(size)).items():
+            if args.filter and args.filter not in name:
+                continue
+            # Builder/image warnings are printed per slide; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = measure(fn, args.iterations)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.threshold)
+    print_report(results, rasterizer)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"rasterizer": rasterizer, "python": sys.version.split()[0],
+                       "results": results}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
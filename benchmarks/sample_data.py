@@ -0,0 +1,31 @@
+# sample_data.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models import PitchDeckData
+from validation import validate_pitch_data
+
+
+def sample_pitch_data(company_name: str = "Acme Robotics") -> PitchDeckData:
+    return validate_pitch_data(sample_record(company_name))
+
+
+def sample_record(company_name: str = "Acme Robotics") -> dict:
+    return dict(
+        company_name=company_name,
+        problem_statement="Warehouses lose 20% of picking time to manual inventory lookups.",
+        solution="Autonomous picking robots that map shelves in real time and route "
+                 "orders through the fastest path in the warehouse.",
+        market_size=12_000_000_000,
+        revenue_model={"Hardware leasing": 60, "Software subscription": 40},
+        roadmap=[
+            {"milestone": "MVP", "start_date": "2024-03", "end_date": "2024-06"},
+            {"milestone": "Pilot", "start_date": "2024-06", "end_date": "2024-12"},
+            {"milestone": "Launch", "start_date": "2025-01", "end_date": "2025-06"},
+        ],
+        team=[{"name": "Jane Doe", "role": "CEO"}, {"name": "John Roe", "role": "CTO"}],
+        traction="3 paying pilots, $250k ARR",
+        future_outlook="Expand to cold-chain logistics",
+    )
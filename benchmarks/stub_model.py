@@ -0,0 +1,96 @@
+# stub_model.py
+# Deterministic, latency-configurable stand-in for the Gemini backend that
+# ModelFactory.create would return. Installed through the shared model pool,
+# so AIContentGenerator runs its real ChatAgent code path without a network.
+import hashlib
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from camel.models import StubModel
+from camel.types import (ChatCompletion, ChatCompletionChunk, ChatCompletionMessage, Choice,
+                         CompletionUsage, ModelType)
+
+import sample_data  # noqa: F401  (imported only to put src/ on sys.path)
+from model_pool import ModelPool, set_model_pool
+
+WORDS = ("scalable platform customers growth market revenue team traction "
+         "product launch pilot retention efficient automation data insight").split()
+
+
+def _content_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content", "")).split()) for m in messages)
+
+
+class ServiceUnavailableError(Exception):
+    # Looks like a transient 503 from the real API
+    status_code = 503
+
+
+class LatencyStubModel(StubModel):
+    # failure_rate of calls raise ServiceUnavailableError; slow_rate of calls
+    # take slow_latency instead of latency (a long tail for hedging to cut)
+    def __init__(self, model_type=ModelType.STUB, model_config_dict: Optional[Dict[str, Any]] = None,
+                 latency: float = 0.0, per_token_latency: float = 0.0, response_words: int = 60,
+                 failure_rate: float = 0.0, slow_rate: float = 0.0, slow_latency: float = 0.0,
+                 rng: random.Random = None, **kwargs):
+        super().__init__(ModelType.STUB, model_config_dict, **kwargs)
+        self.latency = latency
+        self.per_token_latency = per_token_latency
+        self.response_words = response_words
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.rng = rng or random.Random()
+
+    def _inject_faults(self):
+        if self.rng.random() < self.failure_rate:
+            time.sleep(self.latency)
+            raise ServiceUnavailableError("stub model unavailable (injected)")
+        time.sleep(self.slow_latency if self.rng.random() < self.slow_rate else self.latency)
+
+    def _response_words(self, messages) -> List[str]:
+        # Same prompt, same answer
+        prompt = "".join(str(m.get("content", "")) for m in messages)
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        return [WORDS[(seed >> (i % 200)) % len(WORDS)] for i in range(self.response_words)]
+
+    def _run(self, messages, response_format=None, tools=None):
+        words = self._response_words(messages)
+        self._inject_faults()
+        if self.model_config_dict.get("stream"):
+            return self._stream(words)
+        time.sleep(self.per_token_latency * len(words))
+        prompt_tokens = _content_tokens(messages)
+        return ChatCompletion(
+            id="stub", model="stub", object="chat.completion", created=int(time.time()),
+            choices=[Choice(finish_reason="stop", index=0, logprobs=None,
+                            message=ChatCompletionMessage(content=" ".join(words), role="assistant"))],
+            usage=CompletionUsage(prompt_tokens=prompt_tokens, completion_tokens=len(words),
+                                  total_tokens=prompt_tokens + len(words)),
+        )
+
+    def _stream(self, words):
+        for word in words:
+            time.sleep(self.per_token_latency)
+            yield ChatCompletionChunk(
+                id="stub", model="stub", object="chat.completion.chunk", created=int(time.time()),
+                choices=[{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+            )
+
+
+def install_stub_model(latency: float = 0.0, per_token_latency: float = 0.0,
+                       response_words: int = 60, max_size: int = 8, failure_rate: float = 0.0,
+                       slow_rate: float = 0.0, slow_latency: float = 0.0,
+                       seed: Optional[int] = None) -> ModelPool:
+    rng = random.Random(seed)
+
+    def factory(model_platform, model_type, model_config_dict):
+        return LatencyStubModel(model_config_dict=model_config_dict, latency=latency,
+                                per_token_latency=per_token_latency,
+                                response_words=response_words, failure_rate=failure_rate,
+                                slow_rate=slow_rate, slow_latency=slow_latency, rng=rng)
+
+    pool = ModelPool(max_size=max_size, factory=factory)
+    set_model_pool(pool)
+    return pool
@@ -1,58 +1,170 @@
-from typing import Dict, Any
-import os
-import json
-from dotenv import load_dotenv
+from typing import Dict, Any, Callable, Iterator
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from models import PitchDeckData
-from config import Config
-from camel.agents import ChatAgent
-
-load_dotenv()
+from config import Config, RESPONSE_CACHE_BYPASS
+from model_pool import get_model_pool
+from response_cache import get_response_cache, response_cache_key
+from prompts import (Prompt, TokenUsage, count_tokens, elevator_pitch_prompt,
+                     executive_summary_prompt)
+from llm_scheduler import LLMScheduler, get_llm_scheduler
+import instrumentation
 
 class AIContentGenerator:
+    # Failed calls raise LLMCallError (LLMTimeoutError, CircuitOpenError) once
+    # the scheduler's retries and deadline are used up
+    def __init__(self, max_workers: int = 4, config: Config = None,
+                 use_cache: bool = not RESPONSE_CACHE_BYPASS, scheduler: LLMScheduler = None):
+        with instrumentation.span("llm.config_init"):
+            self.config = config or Config()
+        self.model_pool = get_model_pool()
+        # Deadlines, retries, hedging, circuit breaker and rate limit; shared
+        # process-wide by default so concurrent decks respect one limit
+        self.scheduler = scheduler or get_llm_scheduler()
+        self.use_cache = use_cache
+        self.response_cache = get_response_cache()
+        # Input/output tokens per prompt name, accumulated over this generator's calls
+        self.token_usage: Dict[str, TokenUsage] = {}
+        self._usage_lock = threading.Lock()
+        # LLM calls are network-bound, so a small thread pool lets independent
+        # prompts run while the caller keeps building charts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="llm")
+
+    def _run_prompt(self, prompt: Prompt) -> str:
+        key = response_cache_key(prompt.system + prompt.user, self.config)
+        if self.use_cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                instrumentation.count("llm.cache_hits")
+                return cached
         
-    def generate_elevator_pitch(self, pitch_data: PitchDeckData) -> str:
+        content = self.scheduler.call(prompt.name, lambda: self._call_model(prompt))
+        if self.use_cache and content:
+            self.response_cache.set(key, content)
+        return content
+
+    def _call_model(self, prompt: Prompt) -> str:
+        from camel.agents import ChatAgent
+        input_tokens = prompt.input_tokens
+        with instrumentation.span("llm.call", model=str(self.config.model_type),
+                                  prompt=prompt.name, input_tokens=input_tokens) as span:
+            with self.model_pool.acquire(self.config.model_platform,
+                                         self.config.model_type,
+                                         self.config.model_config_dict) as model:
+                # The prompt goes out once, as the user message
+                response = ChatAgent(system_message=prompt.system, model=model).step(prompt.user)
+            content = response.msg.content
+            usage = response.info.get("usage") or {}
+            input_tokens = usage.get("prompt_tokens") or input_tokens
+            output_tokens = usage.get("completion_tokens") or count_tokens(content)
+            span.set(input_tokens=input_tokens, output_tokens=output_tokens)
+        self._record_usage(prompt.name, input_tokens, output_tokens)
+        instrumentation.count("llm.response_bytes", len(content.encode("utf-8")))
+        return content
+
+    def _stream_prompt(self, prompt: Prompt) -> Iterator[str]:
+        key = response_cache_key(prompt.system + prompt.user, self.config)
+        if self.use_cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                instrumentation.count("llm.cache_hits")
+                yield cached
+                return
         
-        # if self.gemini is None: # Check if Gemini model is initialized
-        #     return "Error: Gemini model not initialized."
+        chunks = []
+        input_tokens = prompt.input_tokens
+        with instrumentation.span("llm.stream", model=str(self.config.model_type),
+                                  prompt=prompt.name, input_tokens=input_tokens) as span:
+            for chunk in self.scheduler.stream(prompt.name, lambda: self._open_stream(prompt)):
+                chunks.append(chunk)
+                yield chunk
+            content = "".join(chunks)
+            # Streamed chunks carry no usage, so the output is counted locally
+            output_tokens = count_tokens(content)
+            span.set(chunks=len(chunks), output_tokens=output_tokens)
+        self._record_usage(prompt.name, input_tokens, output_tokens)
+        instrumentation.count("llm.response_bytes", len(content.encode("utf-8")))
+        if self.use_cache and chunks:
+            self.response_cache.set(key, content)
+
+    def _open_stream(self, prompt: Prompt) -> Iterator[str]:
+        # Streaming uses its own pooled backend since stream is part of the model config
+        stream_config = dict(self.config.model_config_dict, stream=True)
+        with self.model_pool.acquire(self.config.model_platform,
+                                     self.config.model_type,
+                                     stream_config) as model:
+            for chunk in model.run(prompt.messages()):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    def _forget(self, prompt: Prompt):
+        # Drop a cached response the caller found unusable so the next run asks again
+        self.response_cache.delete(response_cache_key(prompt.system + prompt.user, self.config))
+
+    def _record_usage(self, name: str, input_tokens: int, output_tokens: int):
+        instrumentation.count("llm.prompt_tokens", input_tokens)
+        instrumentation.count("llm.completion_tokens", output_tokens)
+        with self._usage_lock:
+            self.token_usage.setdefault(name, TokenUsage()).add(input_tokens, output_tokens)
+
+    def _elevator_pitch_prompt(self, pitch_data: PitchDeckData) -> Prompt:
+        return elevator_pitch_prompt(pitch_data)
         
-        prompt = f"""Create a compelling elevator pitch for {pitch_data.company_name}.
-        Problem: {pitch_data.problem_statement}
-        Solution: {pitch_data.solution}
-        Market Size: ${pitch_data.market_size:,.2f}
-        """
-        try:
-            response = ChatAgent(system_message=prompt, model=Config().model).step(prompt)
-            return response.msg.content
-        except Exception as e:
-            print(f"Error generating elevator pitch from Gemini: {e}")
-            return "Error generating elevator pitch. Please check the logs."
+    def generate_elevator_pitch(self, pitch_data: PitchDeckData) -> str:
+        return self._run_prompt(self._elevator_pitch_prompt(pitch_data))
+
+    def stream_elevator_pitch(self, pitch_data: PitchDeckData) -> Iterator[str]:
+        return self._stream_prompt(self._elevator_pitch_prompt(pitch_data))
+
+    def _executive_summary_prompt(self, pitch_data: PitchDeckData) -> Prompt:
+        return executive_summary_prompt(pitch_data)
     
     def generate_executive_summary(self, pitch_data: PitchDeckData) -> str:
-        # if self.gemini is None: # Check if Gemini model is initialized
-        #     return "Error: Gemini model not initialized."
-        
-        team_description = "Experienced team"  # Default
-        
-        if pitch_data.team:
-            try:
-                roles = [member.get('role', 'undefined role') 
-                        for member in pitch_data.team]
-                team_description = f"{len(pitch_data.team)} members with {roles[0]} leadership"
-            except (KeyError, IndexError):
-                team_description = "Core team in place"
-        
-        prompt = f"""Create a concise executive summary for {pitch_data.company_name} covering:
-        - Problem: {pitch_data.problem_statement}
-        - Solution: {pitch_data.solution} 
-        - Market Size: ${pitch_data.market_size:,.2f}
-        - Revenue Model: {json.dumps(pitch_data.revenue_model)}
-        - Key Traction: {pitch_data.traction}
-        - Roadmap Highlights: {pitch_data.roadmap[:2]}
-        - Team Strength: {team_description}
-        """
-
-        try:
-            response = ChatAgent(system_message=prompt, model=Config().model).step(prompt)
-            return response.msg.content
-        except Exception as e:
-            return f"Error generating executive summary. Please check the logs.{e}"
\ No newline at end of file
+        return self._run_prompt(self._executive_summary_prompt(pitch_data))
+
+    def stream_executive_summary(self, pitch_data: PitchDeckData) -> Iterator[str]:
+        return self._stream_prompt(self._executive_summary_prompt(pitch_data))
+
+    def forget_executive_summary(self, pitch_data: PitchDeckData):
+        self._forget(self._executive_summary_prompt(pitch_data))
+
+    # Future-returning variants: submit both prompts up front and collect the
+    # results later, so total latency is the slowest call instead of the sum
+    def submit_elevator_pitch(self, pitch_data: PitchDeckData) -> Future:
+        return self._executor.submit(self.generate_elevator_pitch, pitch_data)
+
+    def submit_executive_summary(self, pitch_data: PitchDeckData) -> Future:
+        return self._executor.submit(self.generate_executive_summary, pitch_data)
+
+    # Streaming variants: tokens are handed to on_token as they arrive and the
+    # future resolves to the full text
+    def submit_elevator_pitch_stream(self, pitch_data: PitchDeckData,
+                                     on_token: Callable[[str], None]) -> Future:
+        return self._executor.submit(self._consume_stream,
+                                     self.stream_elevator_pitch(pitch_data), on_token)
+
+    def submit_executive_summary_stream(self, pitch_data: PitchDeckData,
+                                        on_token: Callable[[str], None]) -> Future:
+        return self._executor.submit(self._consume_stream,
+                                     self.stream_executive_summary(pitch_data), on_token)
+
+    @staticmethod
+    def _consume_stream(tokens: Iterator[str], on_token: Callable[[str], None]) -> str:
+        parts = []
+        for token in tokens:
+            parts.append(token)
+            on_token(token)
+        return "".join(parts)
+
+    # Awaitable variants for asyncio callers
+    async def agenerate_elevator_pitch(self, pitch_data: PitchDeckData) -> str:
+        import asyncio
+        return await asyncio.wrap_future(self.submit_elevator_pitch(pitch_data))
+
+    async def agenerate_executive_summary(self, pitch_data: PitchDeckData) -> str:
+        import asyncio
+        return await asyncio.wrap_future(self.submit_executive_summary(pitch_data))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,17 +1,57 @@
 # app.py
 import streamlit as st
 from models import PitchDeckData
-from main_generator import PitchDeckGenerator
-import json
+from main_generator import PitchDeckGenerator, warm_up
+from validation import PitchDataValidationError, validate_pitch_data
+
+
+@st.cache_resource
+def warm_up_once():
+    # Runs once per server process, not on every Streamlit rerun
+    warm_up()
+    return True
+
+
+def render_generation_progress(generator: PitchDeckGenerator, pitch_data: PitchDeckData) -> bytes:
+    # Shows the pitch text as it streams in and each chart/slide as it finishes
+    progress = st.progress(0.0, text="Writing pitch...")
+    pitch_box = st.empty()
+    summary_box = st.empty()
+    thumbnails = st.container()
+    pitch_text, summary_text = "", ""
+    deck = None
+    
+    for event in generator.iter_generate_pitch_deck(pitch_data):
+        if event.stage == "pitch_token":
+            pitch_text += event.text
+            pitch_box.markdown(f"**Elevator Pitch**\n\n{pitch_text}")
+        elif event.stage == "summary_token":
+            summary_text += event.text
+            summary_box.markdown(f"**Executive Summary**\n\n{summary_text}")
+        elif event.stage == "chart_rendered" and event.image:
+            thumbnails.image(event.image, caption=event.name, width=240)
+        elif event.stage == "slide_built":
+            progress.progress(event.index / event.total,
+                              text=f"Built slide {event.index}/{event.total}: {event.name}")
+        elif event.stage == "done":
+            deck = event.deck
+    
+    progress.progress(1.0, text="Pitch deck ready")
+    return deck
 
 
 def create_streamlit_app():
+    warm_up_once()
     st.title("AI Startup Builder & Pitch Generator")
     st.write("Generate professional pitch decks with AI-powered content and visuals")
     
     # Initialize session state
-    if 'output_path' not in st.session_state:
-        st.session_state.output_path = None
+    if 'deck_bytes' not in st.session_state:
+        st.session_state.deck_bytes = None
+        st.session_state.deck_filename = None
+    if 'generator' not in st.session_state:
+        # Kept across reruns so editing one field only rebuilds what depends on it
+        st.session_state.generator = PitchDeckGenerator()
     
     with st.form("pitch_deck_form"):
         company_name = st.text_input("Company Name")
@@ -62,32 +102,36 @@ def create_streamlit_app():
                 st.write("traction:", traction) # Print traction value
                 st.write("--- End of Debugging ---") 
                 
-                pitch_data = PitchDeckData(
-                    company_name=company_name,
-                    problem_statement=problem,
-                    solution=solution,
-                    market_size=market_size,
-                    revenue_model=json.loads(revenue_streams),
-                    roadmap=json.loads(roadmap),
-                    team=json.loads(team),
-                    traction=traction if traction else "",
-                    future_outlook=future_outlook
-                )
+                # Checked before any LLM call; the JSON fields are parsed here too
+                pitch_data = validate_pitch_data({
+                    "company_name": company_name,
+                    "problem_statement": problem,
+                    "solution": solution,
+                    "market_size": market_size,
+                    "revenue_model": revenue_streams,
+                    "roadmap": roadmap,
+                    "team": team,
+                    "traction": traction,
+                    "future_outlook": future_outlook,
+                })
                 
-                generator = PitchDeckGenerator()
-                output_path = generator.generate_pitch_deck(pitch_data)
-                st.session_state.output_path = output_path
+                generator = st.session_state.generator
+                # Kept in memory so concurrent sessions never share files on disk
+                st.session_state.deck_bytes = render_generation_progress(generator, pitch_data)
+                st.session_state.deck_filename = PitchDeckGenerator.output_filename(pitch_data)
+            except PitchDataValidationError as e:
+                st.error("Please fix the following and try again:\n" +
+                         "\n".join(f"- {error}" for error in e.errors))
             except Exception as e:
                 st.error(f"Error generating pitch deck: {str(e)}")
                 
-    if st.session_state.output_path:
-        with open(st.session_state.output_path, "rb") as file:
-            st.download_button(
-                label="Download Pitch Deck",
-                data=file,
-                file_name=st.session_state.output_path,
-                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-            )
+    if st.session_state.deck_bytes:
+        st.download_button(
+            label="Download Pitch Deck",
+            data=st.session_state.deck_bytes,
+            file_name=st.session_state.deck_filename,
+            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+        )
 
 if __name__ == "__main__":
     create_streamlit_app()
\ No newline at end of file
@@ -0,0 +1,206 @@
+# batch.py
+# Bulk deck generation from JSONL or CSV exports.
+#
+#   python batch.py leads.jsonl --output-dir decks --workers 4 --resume
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ai_content_generator import AIContentGenerator
+from main_generator import PitchDeckGenerator, warm_up
+from validation import PitchDataValidationError, validate_pitch_data
+
+
+def _parse_jsonl(f) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield None, f"line {line_number}: invalid JSON ({e.msg})"
+            continue
+        if not isinstance(row, dict):
+            yield None, f"line {line_number}: expected a JSON object"
+            continue
+        yield row, None
+
+
+def _parse_csv(f) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    rows = csv.DictReader(f)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield None, f"line {rows.line_num}: {e}"
+            continue
+        yield row, None
+
+
+def read_records(path: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    # Streams (record_id, record, parse_error) without loading the whole file.
+    # A line that can't be parsed comes through with record None and the error,
+    # so one bad line fails only its own record
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = _parse_csv(f) if path.lower().endswith(".csv") else _parse_jsonl(f)
+        for index, (row, error) in enumerate(rows):
+            record_id = str((row or {}).get("id") or f"record-{index}")
+            yield record_id, row, error
+
+
+@dataclass
+class RecordResult:
+    id: str
+    status: str
+    output: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+class Manifest:
+    # Append-only JSONL of per-record results; completed ids are skipped on resume
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def completed_ids(self) -> set:
+        done = set()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if entry.get("status") == "ok":
+                            done.add(entry["id"])
+        return done
+
+    def write(self, result: RecordResult):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(result)) + "\n")
+
+
+@dataclass
+class BatchSummary:
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def decks_per_minute(self) -> float:
+        return self.succeeded / self.seconds * 60 if self.seconds else 0.0
+
+
+class BatchRunner:
+    def __init__(self, output_dir: str, workers: int = 4, manifest_path: str = None,
+                 resume: bool = False):
+        self.output_dir = output_dir
+        self.workers = workers
+        self.resume = resume
+        self.manifest = Manifest(manifest_path or os.path.join(output_dir, "manifest.jsonl"))
+        # LLM calls fan out on the shared content generator's pool (two prompts
+        # per deck); chart renders go to the process-wide ChartRenderer and
+        # pptx assembly/writes run on the deck worker threads
+        self.content_generator = AIContentGenerator(max_workers=workers * 2)
+        # Bounds the records held in memory between the reader and the workers
+        self._in_flight = threading.BoundedSemaphore(workers * 2)
+
+    def _build_one(self, record_id: str, record: Dict[str, Any]) -> RecordResult:
+        start = time.perf_counter()
+        try:
+            pitch_data = validate_pitch_data(record)
+            generator = PitchDeckGenerator(content_generator=self.content_generator)
+            deck = generator.generate_pitch_deck(pitch_data, as_bytes=True)
+            output = os.path.join(self.output_dir,
+                                  f"{record_id}_{PitchDeckGenerator.output_filename(pitch_data)}")
+            with open(output, "wb") as f:
+                f.write(deck)
+            result = RecordResult(record_id, "ok", output=output)
+        except Exception as e:
+            result = RecordResult(record_id, "failed", error=f"{type(e).__name__}: {e}")
+        finally:
+            self._in_flight.release()
+        result.seconds = round(time.perf_counter() - start, 3)
+        self.manifest.write(result)
+        return result
+
+    def run(self, input_path: str) -> BatchSummary:
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Pay for the deferred imports once, before the deck threads start
+        warm_up(model=False)
+        done = self.manifest.completed_ids() if self.resume else set()
+        summary = BatchSummary()
+        futures = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="deck") as pool:
+            for record_id, record, error in read_records(input_path):
+                if record_id in done:
+                    summary.skipped += 1
+                    continue
+                if error is not None:
+                    self.manifest.write(RecordResult(record_id, "failed", error=f"ParseError: {error}"))
+                    summary.failed += 1
+                    continue
+                self._in_flight.acquire()
+                futures.append(pool.submit(self._build_one, record_id, record))
+        for future in futures:
+            if future.result().status == "ok":
+                summary.succeeded += 1
+            else:
+                summary.failed += 1
+        summary.seconds = time.perf_counter() - start
+        self.content_generator.shutdown()
+        return summary
+
+
+def check_records(input_path: str) -> Iterator[Tuple[str, List[str]]]:
+    # Validation only: (record_id, errors) for every invalid record, without
+    # generating anything
+    for record_id, record, error in read_records(input_path):
+        if error is not None:
+            yield record_id, [error]
+            continue
+        try:
+            validate_pitch_data(record)
+        except PitchDataValidationError as e:
+            yield record_id, e.errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate pitch decks in bulk")
+    parser.add_argument("input", help="JSONL or CSV file of PitchDeckData records")
+    parser.add_argument("--output-dir", default="decks")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--manifest", help="defaults to <output-dir>/manifest.jsonl")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip records already marked ok in the manifest")
+    parser.add_argument("--check", action="store_true",
+                        help="only validate the records and list the invalid ones")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        invalid = 0
+        for record_id, errors in check_records(args.input):
+            invalid += 1
+            print(f"{record_id}: " + "; ".join(errors))
+        print(f"{invalid} invalid record(s)")
+        raise SystemExit(1 if invalid else 0)
+
+    runner = BatchRunner(args.output_dir, workers=args.workers,
+                         manifest_path=args.manifest, resume=args.resume)
+    summary = runner.run(args.input)
+    print(f"{summary.succeeded} succeeded, {summary.failed} failed, "
+          f"{summary.skipped} skipped in {summary.seconds:.1f}s "
+          f"({summary.decks_per_minute:.1f} decks/min)")
+    print(f"Manifest: {runner.manifest.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# build_graph.py
+# Dependency-tracked memoization for deck generation. Every LLM output, chart
+# and slide is a node that declares the PitchDeckData fields it reads; on a
+# rerun a node is rebuilt only when the fingerprint of those fields changes.
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Tuple
+from cache import stable_hash
+import instrumentation
+
+PITCH_FIELDS = ("company_name", "problem_statement", "solution", "market_size")
+
+NODE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    # LLM outputs
+    "elevator_pitch": PITCH_FIELDS,
+    "executive_summary": PITCH_FIELDS + ("revenue_model", "traction", "roadmap", "team"),
+    # Charts
+    "chart.solution": (),
+    "chart.market": ("market_size",),
+    "chart.revenue": ("revenue_model",),
+    "chart.financials": (),
+    "chart.roadmap": ("roadmap",),
+    "chart.scenarios": ("market_size",),
+    # Slides
+    "slide.problem": ("problem_statement",),
+    "slide.solution": ("company_name", "solution"),
+    "slide.market": ("market_size",),
+    "slide.business_model": ("revenue_model",),
+    "slide.roadmap": ("roadmap",),
+    "slide.traction": ("traction",),
+    "slide.financials": (),
+    "slide.scenarios": ("market_size",),
+    "slide.team": ("team",),
+    "slide.executive_summary": (),
+    "slide.next_steps": (),
+}
+
+
+@dataclass
+class BuildStats:
+    hits: int = 0
+    rebuilds: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BuildGraph:
+    def __init__(self):
+        # node name -> (fingerprint, value); one entry per node, so it stays bounded
+        self._results: Dict[str, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = BuildStats()
+
+    @staticmethod
+    def fingerprint(node: str, pitch_data, *extra: Any) -> str:
+        inputs = {name: getattr(pitch_data, name) for name in NODE_FIELDS[node]}
+        return stable_hash(node, inputs, *extra)
+
+    def build(self, node: str, pitch_data, builder: Callable[[], Any], *extra: Any) -> Any:
+        # extra covers inputs that are not PitchDeckData fields (upstream
+        # results, generator settings)
+        key = self.fingerprint(node, pitch_data, *extra)
+        with self._lock:
+            cached = self._results.get(node)
+            if cached is not None and cached[0] == key:
+                self.stats.hits += 1
+                instrumentation.count("build.hits")
+                return cached[1]
+        value = builder()
+        with self._lock:
+            self._results[node] = (key, value)
+            self.stats.rebuilds += 1
+        instrumentation.count("build.rebuilds")
+        return value
+
+    def is_current(self, node: str, pitch_data, *extra: Any) -> bool:
+        key = self.fingerprint(node, pitch_data, *extra)
+        with self._lock:
+            cached = self._results.get(node)
+        return cached is not None and cached[0] == key
+
+    def discard(self, node: str, value: Any = None):
+        # With a value, only drops the node if it still holds that result
+        with self._lock:
+            cached = self._results.get(node)
+            if cached is not None and (value is None or cached[1] is value):
+                del self._results[node]
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def stable_hash(*parts: Any) -> str:
+    # Canonical JSON keeps the key independent of dict ordering
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        expires = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    # On-disk tier; entries expire after ttl seconds and the least recently
+    # used rows are dropped once max_entries is exceeded
+    def __init__(self, path: str, max_entries: int = 10_000, ttl: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB, created REAL, accessed REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and created + self.ttl < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now))
+            if self.ttl is not None:
+                cur = self._conn.execute("DELETE FROM cache WHERE created < ?", (now - self.ttl,))
+                self.evictions += cur.rowcount
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            if count > self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY accessed ASC LIMIT ?)",
+                    (count - self.max_entries,))
+                self.evictions += cur.rowcount
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    # Memory LRU in front of an optional SQLite tier; disk hits are promoted
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            with self._lock:
+                self.stats.hits += 1
+                self.stats.memory_hits += 1
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                with self._lock:
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                return value
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+        with self._lock:
+            self.stats.evictions = self.memory.evictions + (self.disk.evictions if self.disk else 0)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
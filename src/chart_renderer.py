@@ -0,0 +1,156 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List
+from lazy import lazy_import
+from cache import LRUCache, SQLiteCache, TieredCache, stable_hash
+import instrumentation
+from config import (CHART_CACHE_SIZE, CHART_CACHE_TTL, CHART_CACHE_PATH, CHART_CACHE_DISK_SIZE,
+                    CHART_RENDER_TIMEOUT)
+
+go = lazy_import("plotly.graph_objects")
+pio = lazy_import("plotly.io")
+
+# Layout applied to every chart slide before rasterizing
+CHART_LAYOUT = dict(
+    width=800,
+    height=600,
+    margin=dict(l=20, r=20, t=40, b=20),
+    title_font_size=24,
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)'
+)
+
+
+def apply_chart_layout(fig: "go.Figure") -> "go.Figure":
+    fig.update_layout(**CHART_LAYOUT)
+    return fig
+
+
+def chart_cache_key(fig_json: str, fmt: str) -> str:
+    # Canonical hash of the figure spec (including any layout overrides already
+    # applied) plus the output format and the size the image is rendered at
+    spec = json.loads(fig_json)
+    layout = spec.get("layout", {})
+    width = layout.get("width") or pio.defaults.default_width
+    height = layout.get("height") or pio.defaults.default_height
+    return stable_hash(spec, fmt, width, height)
+
+
+def create_chart_cache() -> TieredCache:
+    disk = None
+    if CHART_CACHE_PATH:
+        disk = SQLiteCache(CHART_CACHE_PATH, max_entries=CHART_CACHE_DISK_SIZE, ttl=CHART_CACHE_TTL)
+    return TieredCache(LRUCache(CHART_CACHE_SIZE, ttl=CHART_CACHE_TTL), disk)
+
+
+def _init_worker():
+    # Keep one kaleido browser alive per worker instead of launching one per figure.
+    # The server starts on a background thread, where a missing browser is never
+    # raised and later renders block forever, so a one-shot render has to work
+    # first; otherwise every render stays one-shot and raises its own error
+    try:
+        import kaleido
+        go.Figure().to_image(format="png")
+        kaleido.start_sync_server(silence_warnings=True)
+    except (ImportError, AttributeError):
+        pass  # kaleido < 1.0 keeps its own persistent scope
+    except Exception as e:
+        print(f"Error starting kaleido server, rendering one figure at a time: {e}")
+
+
+def _render_json(fig_json: str, fmt: str) -> bytes:
+    return pio.from_json(fig_json).to_image(format=fmt)
+
+
+class ChartRenderer:
+    def __init__(self, max_workers: int = None, use_processes: bool = True,
+                 cache: TieredCache = None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self.cache = cache if cache is not None else create_chart_cache()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    # The pool starts after the LLM threads are running, and forking
+                    # a multithreaded process can deadlock the children
+                    method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                              else "spawn")
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                         mp_context=multiprocessing.get_context(method),
+                                                         initializer=_init_worker)
+                else:
+                    _init_worker()
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="render")
+            return self._executor
+
+    def submit(self, fig: "go.Figure", fmt: str = "png") -> Future:
+        # Figures travel to the workers as JSON, which pickles cheaply
+        fig_json = fig.to_json()
+        key = chart_cache_key(fig_json, fmt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            instrumentation.count("chart.cache_hits")
+            future = Future()
+            future.set_result(cached)
+            return future
+        
+        future = self._get_executor().submit(_render_json, fig_json, fmt)
+        future.add_done_callback(lambda f: self._store(key, f))
+        return future
+
+    def _store(self, key: str, future: Future):
+        if not future.cancelled() and future.exception() is None:
+            instrumentation.count("chart.rendered_bytes", len(future.result()))
+            self.cache.set(key, future.result())
+
+    def render(self, fig: "go.Figure", fmt: str = "png") -> bytes:
+        # Synchronous, in-process render that still goes through the cache
+        fig_json = fig.to_json()
+        key = chart_cache_key(fig_json, fmt)
+        image = self.cache.get(key)
+        if image is None:
+            with instrumentation.span("chart.render", format=fmt):
+                image = _render_json(fig_json, fmt)
+            instrumentation.count("chart.rendered_bytes", len(image))
+            self.cache.set(key, image)
+        else:
+            instrumentation.count("chart.cache_hits")
+        return image
+
+    def submit_many(self, figs: Dict[str, "go.Figure"], fmt: str = "png") -> Dict[str, Future]:
+        return {key: self.submit(fig, fmt) for key, fig in figs.items() if fig is not None}
+
+    def render_many(self, figs: List["go.Figure"], fmt: str = "png",
+                    timeout: float = CHART_RENDER_TIMEOUT) -> List[bytes]:
+        futures = [self.submit(fig, fmt) for fig in figs]
+        end = time.monotonic() + timeout
+        return [future.result(timeout=max(end - time.monotonic(), 0)) for future in futures]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    # Process-wide so the worker pool and its browsers are started once
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = ChartRenderer()
+    return _renderer
@@ -1,26 +1,93 @@
-from camel.models import ModelFactory
-from camel.types import ModelPlatformType , ModelType
-from camel.configs import GeminiConfig
 from dotenv import load_dotenv
 import os
 
+# The only .env load; settings below are read from the environment once
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Maximum number of concurrent LLM calls sharing the process-wide model pool
+MODEL_POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "8"))
+
+# LLM response cache: in-memory LRU plus an optional SQLite tier when a path is set
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+RESPONSE_CACHE_DISK_SIZE = int(os.getenv("RESPONSE_CACHE_DISK_SIZE", "10000"))
+RESPONSE_CACHE_BYPASS = os.getenv("RESPONSE_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+# Prompt budget in (locally counted) tokens: per user-supplied field, and for
+# all fields of one prompt together; longer text is truncated
+PROMPT_FIELD_TOKENS = int(os.getenv("PROMPT_FIELD_TOKENS", "400"))
+PROMPT_MAX_TOKENS = int(os.getenv("PROMPT_MAX_TOKENS", "1500"))
+
+# LLM call scheduling: seconds per call including retries, retry count, hedged
+# duplicates past the p95 latency, requests/second shared by every deck in the
+# process (0 = unlimited) and the circuit breaker's failure threshold and cool-off
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "").lower() in ("1", "true", "yes")
+LLM_RATE_LIMIT = float(os.getenv("LLM_RATE_LIMIT", "0"))
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "4"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+# Pipeline tracing sink: "log", "json:<path>" or "prometheus:<path>"; unset disables tracing
+TRACE_SINK = os.getenv("PITCH_TRACE")
+
+# How chart slides are drawn: "image" (Plotly -> PNG) or "native" (PowerPoint
+# charts where the figure type allows it, images otherwise)
+CHART_MODE = os.getenv("CHART_MODE", "image")
+
+# Rendered chart image cache, same layout as the response cache
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "64"))
+CHART_CACHE_TTL = float(os.getenv("CHART_CACHE_TTL", str(30 * 24 * 3600)))
+CHART_CACHE_PATH = os.getenv("CHART_CACHE_PATH")
+CHART_CACHE_DISK_SIZE = int(os.getenv("CHART_CACHE_DISK_SIZE", "2000"))
+
+# Seconds a deck waits for its batch of background chart renders
+CHART_RENDER_TIMEOUT = float(os.getenv("CHART_RENDER_TIMEOUT", "60"))
+
 class Config:
+    # camel is only imported when the model settings are first read, so
+    # constructing a Config (and importing this module) stays cheap
     
-    def __init__(self):
-        self.model = ModelFactory.create(
-            model_platform=ModelPlatformType.GEMINI,
-            model_type= ModelType.GEMINI_2_0_FLASH,
-            model_config_dict = GeminiConfig().as_dict()
-        )
-
-        
-        
-        
+    def __init__(self, model_platform=None, model_type=None, model_config_dict: dict = None):
+        self._model_platform = model_platform
+        self._model_type = model_type
+        self._model_config_dict = model_config_dict
+        self._model = None
         
+    @property
+    def model_platform(self):
+        if self._model_platform is None:
+            from camel.types import ModelPlatformType
+            self._model_platform = ModelPlatformType.GEMINI
+        return self._model_platform
     
-
-
+    @property
+    def model_type(self):
+        if self._model_type is None:
+            from camel.types import ModelType
+            self._model_type = ModelType.GEMINI_2_0_FLASH
+        return self._model_type
+    
+    @property
+    def model_config_dict(self) -> dict:
+        if self._model_config_dict is None:
+            from camel.configs import GeminiConfig
+            self._model_config_dict = GeminiConfig().as_dict()
+        return self._model_config_dict
+        
+    @property
+    def model(self):
+        # Builds a dedicated backend; prompt generation goes through
+        # model_pool.get_model_pool() instead so clients are reused
+        if self._model is None:
+            from camel.models import ModelFactory
+            self._model = ModelFactory.create(
+                model_platform=self.model_platform,
+                model_type= self.model_type,
+                model_config_dict = self.model_config_dict
+            )
+        return self._model
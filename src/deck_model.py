@@ -0,0 +1,80 @@
+# deck_model.py
+# Format-independent representation of a finished deck. Built once per
+# generation; every exporter reads from it and shares its rendered assets.
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from models import SlideContent, VisualType
+from chart_renderer import ChartRenderer, get_chart_renderer
+
+
+@dataclass
+class ChartAsset:
+    key: str
+    figure: Any
+    renderer: ChartRenderer = field(default_factory=get_chart_renderer, repr=False)
+    _images: Dict[str, bytes] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def image(self, fmt: str) -> bytes:
+        # Rendered at most once per format, even with exporters running in parallel
+        with self._lock:
+            if fmt not in self._images:
+                self._images[fmt] = self.renderer.render(self.figure, fmt)
+            return self._images[fmt]
+
+    def png(self) -> bytes:
+        return self.image("png")
+
+    def svg(self) -> str:
+        return self.image("svg").decode("utf-8")
+
+    def seed(self, fmt: str, data: bytes):
+        # Reuse an image the pipeline already rendered
+        with self._lock:
+            self._images.setdefault(fmt, data)
+
+
+@dataclass
+class DeckSlide:
+    title: str
+    content: str
+    visual_type: Optional[VisualType] = None
+    chart: Optional[ChartAsset] = None
+    image_path: Optional[str] = None
+
+    def to_slide_content(self, with_png: bool = True) -> SlideContent:
+        visual_data = None
+        if self.chart is not None:
+            visual_data = {"chart": self.chart.figure}
+            if with_png:
+                visual_data["png"] = self.chart.png()
+        elif self.image_path:
+            visual_data = {"image": self.image_path}
+        return SlideContent(title=self.title, content=self.content,
+                            visual_type=self.visual_type, visual_data=visual_data)
+
+
+@dataclass
+class DeckDocument:
+    company_name: str
+    subtitle: str
+    slides: List[DeckSlide]
+    assets: Dict[str, ChartAsset]
+
+    @classmethod
+    def from_slides(cls, company_name: str, subtitle: str, slides: List[SlideContent],
+                    charts: Dict[str, Any], renderer: ChartRenderer = None) -> "DeckDocument":
+        renderer = renderer or get_chart_renderer()
+        assets = {key: ChartAsset(key, fig, renderer) for key, fig in charts.items() if fig is not None}
+        by_figure = {id(asset.figure): asset for asset in assets.values()}
+        deck_slides = []
+        for slide in slides:
+            visual_data = slide.visual_data or {}
+            asset = by_figure.get(id(visual_data.get("chart")))
+            if asset is not None and visual_data.get("png"):
+                asset.seed("png", visual_data["png"])
+            deck_slides.append(DeckSlide(title=slide.title, content=slide.content,
+                                         visual_type=slide.visual_type, chart=asset,
+                                         image_path=visual_data.get("image")))
+        return cls(company_name, subtitle, deck_slides, assets)
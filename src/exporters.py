@@ -0,0 +1,147 @@
+# exporters.py
+# Exporters that turn one DeckDocument into pptx, HTML, Markdown or PDF.
+# Register extra formats with register_exporter().
+import base64
+import html
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+from deck_model import DeckDocument, DeckSlide
+from presentation_builder import PresentationBuilder
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+class PptxExporter:
+    extension = "pptx"
+
+    def __init__(self, template_path: str = None, chart_mode: str = "image"):
+        self.template_path = template_path
+        self.chart_mode = chart_mode
+
+    def export(self, doc: DeckDocument) -> bytes:
+        builder = PresentationBuilder(self.template_path, chart_mode=self.chart_mode)
+        builder.add_title_slide(doc.company_name, doc.subtitle)
+        for slide in doc.slides:
+            # Native charts need no raster, so skip rendering one
+            builder.add_content_slide(slide.to_slide_content(with_png=self.chart_mode != "native"))
+        return builder.to_bytes()
+
+
+class HtmlExporter:
+    # Single self-contained file: charts as inline SVG, images as data URIs
+    extension = "html"
+
+    def _content(self, text: str) -> str:
+        parts, items = [], []
+        for line in text.split("\n"):
+            line = _BOLD.sub(r"<strong>\1</strong>", html.escape(line))
+            if line.startswith("- "):
+                items.append(f"<li>{line[2:]}</li>")
+                continue
+            if items:
+                parts.append("<ul>" + "".join(items) + "</ul>")
+                items = []
+            if line.strip():
+                parts.append(f"<p>{line}</p>")
+        if items:
+            parts.append("<ul>" + "".join(items) + "</ul>")
+        return "\n".join(parts)
+
+    def _visual(self, slide: DeckSlide) -> str:
+        if slide.chart is not None:
+            return f'<div class="visual">{slide.chart.svg()}</div>'
+        if slide.image_path and os.path.exists(slide.image_path):
+            with open(slide.image_path, "rb") as f:
+                data = base64.b64encode(f.read()).decode("ascii")
+            return f'<div class="visual"><img src="data:image/png;base64,{data}" alt=""></div>'
+        return ""
+
+    def export(self, doc: DeckDocument) -> bytes:
+        sections = [f'<section class="title"><h1>{html.escape(doc.company_name)}</h1>'
+                    f'<p class="subtitle">{html.escape(doc.subtitle)}</p></section>']
+        for slide in doc.slides:
+            sections.append(f'<section><h2>{html.escape(slide.title.upper())}</h2>'
+                            f'<div class="content">{self._content(slide.content)}</div>'
+                            f'{self._visual(slide)}</section>')
+        page = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(doc.company_name)}</title>
+<style>
+body {{ font-family: sans-serif; background: #f5f5f5; color: #323232; margin: 0; }}
+section {{ background: #fff; margin: 24px auto; padding: 32px; max-width: 1100px; overflow: hidden; }}
+h1, h2 {{ color: #00467a; text-align: center; }}
+.subtitle {{ font-style: italic; color: #646464; text-align: center; font-size: 1.3em; }}
+.content {{ float: left; width: 48%; font-size: 1.2em; }}
+.visual {{ float: right; width: 48%; }}
+.visual svg, .visual img {{ width: 100%; height: auto; }}
+</style></head>
+<body>
+{chr(10).join(sections)}
+</body></html>
+"""
+        return page.encode("utf-8")
+
+
+class MarkdownExporter:
+    # Handout with charts embedded as PNG data URIs
+    extension = "md"
+
+    def export(self, doc: DeckDocument) -> bytes:
+        lines = [f"# {doc.company_name}", "", f"*{doc.subtitle.strip()}*", ""]
+        for slide in doc.slides:
+            lines += [f"## {slide.title}", "", slide.content, ""]
+            if slide.chart is not None:
+                data = base64.b64encode(slide.chart.png()).decode("ascii")
+                lines += [f"![{slide.title}](data:image/png;base64,{data})", ""]
+        return "\n".join(lines).encode("utf-8")
+
+
+class PdfExporter:
+    # Converts the pptx export with a local LibreOffice install
+    extension = "pdf"
+
+    def __init__(self, pptx_exporter: PptxExporter = None, timeout: float = 120):
+        self.pptx_exporter = pptx_exporter or PptxExporter()
+        self.timeout = timeout
+
+    def export(self, doc: DeckDocument) -> bytes:
+        soffice = shutil.which("soffice") or shutil.which("libreoffice")
+        if soffice is None:
+            raise RuntimeError("PDF export requires LibreOffice (soffice) on PATH")
+        with tempfile.TemporaryDirectory() as workdir:
+            source = os.path.join(workdir, "deck.pptx")
+            with open(source, "wb") as f:
+                f.write(self.pptx_exporter.export(doc))
+            subprocess.run([soffice, "--headless", "--convert-to", "pdf", "--outdir", workdir, source],
+                           check=True, capture_output=True, timeout=self.timeout)
+            with open(os.path.join(workdir, "deck.pdf"), "rb") as f:
+                return f.read()
+
+
+EXPORTERS = {
+    "pptx": PptxExporter(),
+    "html": HtmlExporter(),
+    "md": MarkdownExporter(),
+    "pdf": PdfExporter(),
+}
+
+
+def register_exporter(name: str, exporter):
+    EXPORTERS[name] = exporter
+
+
+def export_all(doc: DeckDocument, formats: Iterable[str] = ("pptx",),
+               max_workers: int = 4, overrides: Dict[str, object] = None) -> Dict[str, bytes]:
+    # Exporters run in parallel; chart assets render once and are shared
+    formats = list(formats)
+    registry = dict(EXPORTERS, **(overrides or {}))
+    unknown = [fmt for fmt in formats if fmt not in registry]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(unknown)}")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export") as pool:
+        futures = {fmt: pool.submit(registry[fmt].export, doc) for fmt in formats}
+        return {fmt: future.result() for fmt, future in futures.items()}
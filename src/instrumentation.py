@@ -0,0 +1,188 @@
+# instrumentation.py
+# Spans and counters around the deck pipeline. With no sink configured every
+# call returns immediately, so the hooks can stay on hot paths.
+import functools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from config import TRACE_SINK
+
+logger = logging.getLogger("pitch_deck.trace")
+
+
+class LogSink:
+    def emit(self, record: Dict[str, Any]):
+        if record["type"] == "span":
+            logger.info("%s %.1fms %s", record["name"], record["duration_ms"], record["attrs"])
+        else:
+            logger.info("%s +%s", record["name"], record["value"])
+
+    def flush(self):
+        pass
+
+
+class JSONFileSink:
+    # One JSON object per line
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict[str, Any]):
+        line = json.dumps(record, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def flush(self):
+        pass
+
+
+class PrometheusSink:
+    # Aggregates in memory; flush() rewrites the file in the text exposition format
+    def __init__(self, path: Optional[str] = None, prefix: str = "pitch_deck"):
+        self.path = path
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._span_count = defaultdict(int)
+        self._span_seconds = defaultdict(float)
+        self._counters = defaultdict(float)
+
+    def emit(self, record: Dict[str, Any]):
+        with self._lock:
+            if record["type"] == "span":
+                self._span_count[record["name"]] += 1
+                self._span_seconds[record["name"]] += record["duration_ms"] / 1000
+            else:
+                self._counters[record["name"]] += record["value"]
+
+    def render(self) -> str:
+        p = self.prefix
+        with self._lock:
+            lines = [f"# TYPE {p}_span_seconds summary"]
+            for name in sorted(self._span_count):
+                lines.append(f'{p}_span_seconds_sum{{span="{name}"}} {self._span_seconds[name]:.6f}')
+                lines.append(f'{p}_span_seconds_count{{span="{name}"}} {self._span_count[name]}')
+            for name in sorted(self._counters):
+                metric = f"{p}_{name.replace('.', '_')}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self._counters[name]:g}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        if self.path:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(self.render())
+
+
+def sink_from_spec(spec: Optional[str]):
+    if not spec:
+        return None
+    kind, _, path = spec.partition(":")
+    if kind == "log":
+        return LogSink()
+    if kind == "json":
+        return JSONFileSink(path or "pitch_trace.jsonl")
+    if kind == "prometheus":
+        return PrometheusSink(path or None)
+    raise ValueError(f"Unknown trace sink: {spec}")
+
+
+_sink = sink_from_spec(TRACE_SINK)
+_local = threading.local()
+
+
+def set_sink(sink):
+    # Pass None to disable tracing
+    global _sink
+    _sink = sink
+
+
+def get_sink():
+    return _sink
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, sink, name: str, attrs: Dict[str, Any]):
+        self.sink = sink
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        _local.stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.sink.emit({
+            "type": "span",
+            "name": self.name,
+            "parent": self.parent,
+            "duration_ms": duration * 1000,
+            "attrs": self.attrs,
+            "ts": time.time(),
+        })
+        return False
+
+
+def span(name: str, **attrs):
+    sink = _sink
+    if sink is None:
+        return _NULL_SPAN
+    return _Span(sink, name, attrs)
+
+
+def traced(name: str):
+    # Decorator form of span()
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1):
+    sink = _sink
+    if sink is None or not value:
+        return
+    sink.emit({"type": "counter", "name": name, "value": value, "ts": time.time()})
+
+
+def flush():
+    sink = _sink
+    if sink is not None:
+        sink.flush()
@@ -0,0 +1,36 @@
+# lazy.py
+import importlib
+import importlib.util
+import threading
+
+
+class _LazyModule:
+    # Stands in for a module until an attribute is first read. The real import
+    # runs once, under a lock, through the normal import system, so concurrent
+    # first use from worker threads never sees a half-initialized module
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str):
+    # Returns a proxy right away; the module is imported on first attribute
+    # access, so heavy dependencies are paid for when first used
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named '{name}'")
+    return _LazyModule(name)
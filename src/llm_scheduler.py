@@ -0,0 +1,334 @@
+# llm_scheduler.py
+# Runs LLM calls with a per-call deadline, exponential-backoff retries on
+# transient errors, optional hedged duplicates once a call outlives the recent
+# p95 latency, a circuit breaker and a token-bucket rate limit. One scheduler is
+# shared per process, so the rate limit and breaker cover every concurrent deck.
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+from config import (LLM_BREAKER_RESET, LLM_BREAKER_THRESHOLD, LLM_DEADLINE, LLM_HEDGE,
+                    LLM_MAX_RETRIES, LLM_RATE_BURST, LLM_RATE_LIMIT)
+import instrumentation
+
+TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+TRANSIENT_NAMES = ("Timeout", "RateLimit", "Connection", "ServiceUnavailable",
+                   "InternalServerError", "ResourceExhausted", "DeadlineExceeded")
+
+
+class LLMCallError(Exception):
+    def __init__(self, message: str, prompt: str = None, attempts: int = 0):
+        super().__init__(message)
+        self.prompt = prompt
+        self.attempts = attempts
+
+
+class LLMTimeoutError(LLMCallError):
+    pass
+
+
+class CircuitOpenError(LLMCallError):
+    pass
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status in TRANSIENT_STATUS:
+        return True
+    return any(name in type(error).__name__ for name in TRANSIENT_NAMES)
+
+
+class TokenBucket:
+    # rate requests per second with bursts of up to capacity; rate <= 0 disables it
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: float) -> bool:
+        if self.rate <= 0:
+            return True
+        end = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                delay = (1 - self._tokens) / self.rate
+            if now + delay > end:
+                return False
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    # Opens after `threshold` consecutive failures; after `reset_timeout` one
+    # trial call is let through and its outcome closes or re-opens the circuit
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return False
+
+    def release(self):
+        # Ends a half-open trial whose error says nothing about backend health
+        # (e.g. a bad request); the circuit stays open and the next call gets the trial
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.threshold:
+                if self.state != "open":
+                    instrumentation.count("llm.breaker_opened")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+
+@dataclass
+class SchedulerStats:
+    calls: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    short_circuits: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LLMScheduler:
+    def __init__(self, deadline: float = LLM_DEADLINE, max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0, hedge: bool = LLM_HEDGE,
+                 rate_limiter: TokenBucket = None, breaker: CircuitBreaker = None,
+                 max_workers: int = 16):
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.rate_limiter = rate_limiter or TokenBucket(LLM_RATE_LIMIT, LLM_RATE_BURST)
+        self.breaker = breaker or CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_RESET)
+        self.latency = LatencyTracker()
+        self.stats = SchedulerStats()
+        self._stats_lock = threading.Lock()
+        # Attempts run here so the caller can stop waiting at the deadline. A
+        # timed-out attempt can't be interrupted and finishes in the background
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-call")
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + amount)
+        instrumentation.count(f"llm.{name}", amount)
+
+    def _backoff(self, attempt: int, remaining: float) -> float:
+        # Full jitter, capped so a retry never sleeps past the deadline
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return min(delay, max(remaining, 0))
+
+    def _admit(self, name: str, end: float, attempts: int):
+        # Take the rate-limit token first: allow() may start the half-open trial,
+        # and only a call that is actually made can end it
+        if not self.rate_limiter.acquire(end - time.monotonic()):
+            self._count("timeouts")
+            raise LLMTimeoutError(f"'{name}' hit its deadline waiting for the rate limiter",
+                                  name, attempts)
+        if not self.breaker.allow():
+            self._count("short_circuits")
+            raise CircuitOpenError(f"LLM circuit open, not calling '{name}'", name, attempts)
+
+    def _record_error(self, error: Exception):
+        # Only outages (transient errors and deadline timeouts) count against the
+        # shared breaker; one record's bad input must not fail every other deck
+        if is_transient(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+
+    def _retry_or_raise(self, name: str, error: Exception, attempt: int, end: float):
+        self._record_error(error)
+        remaining = end - time.monotonic()
+        if not is_transient(error) or attempt >= self.max_retries or remaining <= 0:
+            self._count("failures")
+            if isinstance(error, TimeoutError):
+                raise LLMTimeoutError(f"'{name}' did not finish within {self.deadline:.0f}s",
+                                      name, attempt + 1) from error
+            raise LLMCallError(f"'{name}' failed after {attempt + 1} attempt(s): {error}",
+                               name, attempt + 1) from error
+        self._count("retries")
+        time.sleep(self._backoff(attempt, remaining))
+
+    def call(self, name: str, fn: Callable[[], str]) -> str:
+        self._count("calls")
+        end = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._admit(name, end, attempt)
+            start = time.monotonic()
+            try:
+                result = self._attempt(fn, end)
+            except Exception as e:
+                self._retry_or_raise(name, e, attempt, end)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            self.latency.record(time.monotonic() - start)
+            return result
+
+    def _attempt(self, fn: Callable[[], str], end: float) -> str:
+        pending = {self._executor.submit(fn)}
+        hedge = None
+        hedge_after = self.latency.p95() if self.hedge else None
+        if hedge_after is not None and time.monotonic() + hedge_after < end:
+            done, _ = wait(pending, timeout=hedge_after)
+            # A hedge only goes out if the rate limit has room right now
+            if not done and self.rate_limiter.try_acquire():
+                self._count("hedges")
+                hedge = self._executor.submit(fn)
+                pending.add(hedge)
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(end - time.monotonic(), 0),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                self._count("timeouts")
+                raise TimeoutError("LLM call exceeded its deadline")
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stream(self, name: str, open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        # Same deadline, breaker and rate limit for a streamed call. Failures
+        # before the first chunk are retried; once text has been yielded they raise
+        self._count("calls")
+        end = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._admit(name, end, attempt)
+            chunks = queue.Queue()
+            self._executor.submit(self._produce, open_stream, chunks)
+            yielded = False
+            try:
+                while True:
+                    try:
+                        kind, value = chunks.get(timeout=max(end - time.monotonic(), 0))
+                    except queue.Empty:
+                        self._count("timeouts")
+                        raise TimeoutError("LLM stream exceeded its deadline")
+                    if kind == "error":
+                        raise value
+                    if kind == "done":
+                        self.breaker.record_success()
+                        return
+                    yielded = True
+                    yield value
+            except GeneratorExit:
+                # The consumer stopped reading after text arrived, so the backend
+                # is up; without an outcome a half-open breaker would never close
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                if yielded:
+                    self._record_error(e)
+                    self._count("failures")
+                    raise LLMCallError(f"'{name}' failed mid-stream: {e}", name, attempt + 1) from e
+                self._retry_or_raise(name, e, attempt, end)
+                attempt += 1
+
+    @staticmethod
+    def _produce(open_stream: Callable[[], Iterator[str]], chunks: queue.Queue):
+        try:
+            for chunk in open_stream():
+                chunks.put(("chunk", chunk))
+            chunks.put(("done", None))
+        except Exception as e:
+            chunks.put(("error", e))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def set_llm_scheduler(scheduler: LLMScheduler):
+    # For benchmarks and tests that need different limits or a fresh breaker
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -1,91 +1,368 @@
 from ai_content_generator import AIContentGenerator
 from visualization_generator import VisualizationGenerator
-from presentation_builder import PresentationBuilder
-from models import PitchDeckData, SlideContent, VisualType
-from typing import List
+from chart_renderer import apply_chart_layout, get_chart_renderer
+from config import Config, CHART_MODE, CHART_RENDER_TIMEOUT
+from model_pool import get_model_pool
+from lazy import lazy_import
+from deck_model import DeckDocument
+from build_graph import BuildGraph
+from projections import DEFAULT_MARKET_SPLIT, ScenarioConfig, market_segments, project
+from models import GenerationEvent, PitchDeckData, SlideContent, VisualType
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import queue
+import time
+import instrumentation
+
+# python-pptx is only loaded when the first deck is assembled
+presentation_builder = lazy_import("presentation_builder")
+native_charts = lazy_import("native_charts")
+exporters = lazy_import("exporters")
+
+
+def warm_up(model: bool = True):
+    # One-time hook for worker or app start-up: pays for the deferred imports,
+    # the template and (optionally) a pooled model client before the first request
+    with instrumentation.span("warm_up"):
+        import camel.agents  # noqa: F401
+        # plotly pulls pandas in lazily from several places; two deck threads
+        # doing that at once can see a half-initialized module
+        import pandas  # noqa: F401
+        import plotly.express  # noqa: F401
+        viz = VisualizationGenerator()
+        viz.create_revenue_projection({"warm_up": 1.0})
+        viz.create_financial_forecast()
+        market_segments(1.0, DEFAULT_MARKET_SPLIT)
+        presentation_builder.PresentationBuilder().close()
+        if model:
+            config = Config()
+            try:
+                with get_model_pool().acquire(config.model_platform, config.model_type,
+                                              config.model_config_dict):
+                    pass
+            except Exception as e:
+                print(f"Error warming up model client: {e}")
 
 
 class PitchDeckGenerator:
-    def __init__(self):
-        self.content_generator = AIContentGenerator()
+    def __init__(self, content_generator: AIContentGenerator = None, template_path: str = None,
+                 scenarios: ScenarioConfig = None, chart_mode: str = CHART_MODE):
+        # Batch callers share one content generator (and its LLM thread pool)
+        self.content_generator = content_generator or AIContentGenerator()
         self.viz_generator = VisualizationGenerator()
-        self.presentation_builder = PresentationBuilder()
+        self.template_path = template_path
+        # Adds scenario and sensitivity slides when set
+        self.scenarios = scenarios
+        # "native" draws bar/pie/line charts as PowerPoint charts instead of images
+        self.chart_mode = chart_mode
+        self.chart_renderer = get_chart_renderer()
+        # Memoized LLM outputs, charts and slides; a rerun with edited data
+        # only rebuilds the nodes whose input fields changed
+        self.build_graph = BuildGraph()
+        self._render_futures: Dict[str, Tuple[Any, Future]] = {}
         
-    def generate_pitch_deck(self, pitch_data: PitchDeckData) -> str:
-        # Generate elevator pitch and executive summary
-        elevator_pitch = self.content_generator.generate_elevator_pitch(pitch_data)
-        exec_summary = self.content_generator.generate_executive_summary(pitch_data)
+    def generate_pitch_deck(self, pitch_data: PitchDeckData,
+                            as_bytes: bool = False) -> Union[str, bytes]:
+        try:
+            with instrumentation.span("deck.generate", company=pitch_data.company_name):
+                return self._generate_pitch_deck(pitch_data, as_bytes)
+        finally:
+            instrumentation.flush()
+    
+    def _generate_pitch_deck(self, pitch_data: PitchDeckData, as_bytes: bool) -> Union[str, bytes]:
+        elevator_pitch, exec_summary, charts, render_futures = self._generate_content(pitch_data)
+        presentation_builder = self.assemble_pitch_deck(
+            pitch_data, elevator_pitch, exec_summary, charts, render_futures)
         
-        # Create presentation
-        self.presentation_builder.add_title_slide(
+        # Return the deck from memory, or save it to disk
+        if as_bytes:
+            return presentation_builder.to_bytes()
+        output_path = self.output_filename(pitch_data)
+        presentation_builder.save(output_path)
+        return output_path
+    
+    def build_deck_document(self, pitch_data: PitchDeckData) -> DeckDocument:
+        # Same pipeline up to the finished slides, kept format-independent
+        elevator_pitch, exec_summary, charts, render_futures = self._generate_content(pitch_data)
+        slides = self._finish_slides(pitch_data, exec_summary, charts, render_futures)
+        return DeckDocument.from_slides(pitch_data.company_name, elevator_pitch, slides, charts,
+                                        self.chart_renderer)
+    
+    def export_pitch_deck(self, pitch_data: PitchDeckData,
+                          formats=("pptx", "html", "md")) -> Dict[str, bytes]:
+        # One generation, several output formats rendered in parallel
+        with instrumentation.span("deck.export", formats=",".join(formats)):
+            doc = self.build_deck_document(pitch_data)
+            # The PDF is converted from the same configured pptx export
+            pptx = exporters.PptxExporter(self.template_path, self.chart_mode)
+            result = exporters.export_all(doc, formats,
+                                          overrides={"pptx": pptx, "pdf": exporters.PdfExporter(pptx)})
+        instrumentation.flush()
+        return result
+    
+    def _start_generation(self, pitch_data: PitchDeckData,
+                          on_token: Callable[[str, str], None] = None) -> Tuple[Future, Future,
+                                                                                 Dict[str, Any],
+                                                                                 Dict[str, Future]]:
+        # Fan out the independent LLM calls and build the charts while they run.
+        # With on_token the calls stream and each token is passed on with its stage
+        content = self.content_generator
+        futures = []
+        for node, stage, submit, submit_stream in (
+                ("elevator_pitch", "pitch_token", content.submit_elevator_pitch,
+                 content.submit_elevator_pitch_stream),
+                ("executive_summary", "summary_token", content.submit_executive_summary,
+                 content.submit_executive_summary_stream)):
+            if on_token is None:
+                futures.append(self._submit_llm(node, pitch_data, submit))
+                continue
+            memoized = self.build_graph.is_current(node, pitch_data)
+            future = self._submit_llm(
+                node, pitch_data,
+                lambda data, submit=submit_stream, stage=stage: submit(
+                    data, lambda token: on_token(stage, token)))
+            # A memoized result arrives as one chunk instead of streaming again
+            if memoized and future.done():
+                on_token(stage, future.result())
+            futures.append(future)
+        charts, render_futures = self.prepare_charts(pitch_data)
+        return futures[0], futures[1], charts, render_futures
+    
+    def _generate_content(self, pitch_data: PitchDeckData) -> Tuple[str, str, Dict[str, Any],
+                                                                    Dict[str, Future]]:
+        pitch_future, summary_future, charts, render_futures = self._start_generation(pitch_data)
+        with instrumentation.span("deck.wait_llm"):
+            elevator_pitch = pitch_future.result()
+            exec_summary = summary_future.result()
+        return elevator_pitch, exec_summary, charts, render_futures
+    
+    def _finish_slides(self, pitch_data: PitchDeckData, exec_summary: str, charts: Dict[str, Any],
+                       render_futures: Dict[str, Future]) -> List[SlideContent]:
+        slides = self._generate_slides(pitch_data, exec_summary, charts)
+        with instrumentation.span("deck.wait_charts"):
+            self._attach_rendered_charts(slides, charts, render_futures)
+        return slides
+    
+    def _submit_llm(self, node: str, pitch_data: PitchDeckData,
+                    submit: Callable[[PitchDeckData], Future]) -> Future:
+        future = self.build_graph.build(node, pitch_data, lambda: submit(pitch_data))
+        # Added after the node is stored: a future that has already failed runs
+        # the callback at once, and the discard must find it
+        future.add_done_callback(lambda f: self._forget_failed(node, f))
+        return future
+    
+    def _forget_failed(self, node: str, future: Future):
+        # Failed calls are retried on the next run instead of being memoized
+        if future.exception() is not None:
+            self.build_graph.discard(node, future)
+    
+    def prepare_charts(self, pitch_data: PitchDeckData) -> Tuple[Dict[str, Any], Dict[str, Future]]:
+        # Builds the figures and rasterizes them in one batch in the background
+        with instrumentation.span("deck.build_charts"):
+            charts = self._build_charts(pitch_data)
+        to_render = charts
+        if self.chart_mode == "native":
+            # Charts drawn natively never need a PNG
+            to_render = {key: chart for key, chart in charts.items() if not native_charts.supports(chart)}
+        # Unchanged figures keep the render already submitted for them
+        render_futures, to_submit = {}, {}
+        for key, chart in to_render.items():
+            previous = self._render_futures.get(key)
+            if previous and previous[0] is chart and not (previous[1].done() and previous[1].exception()):
+                render_futures[key] = previous[1]
+            else:
+                to_submit[key] = chart
+        render_futures.update(self.chart_renderer.submit_many(to_submit))
+        self._render_futures = {key: (to_render[key], future) for key, future in render_futures.items()}
+        return charts, render_futures
+    
+    def assemble_pitch_deck(self, pitch_data: PitchDeckData, elevator_pitch: str, exec_summary: str,
+                            charts: Dict[str, Any],
+                            render_futures: Dict[str, Future]) -> "presentation_builder.PresentationBuilder":
+        # Create presentation; each deck gets its own builder, which releases
+        # the presentation once saved
+        presentation_builder = self.new_presentation_builder()
+        presentation_builder.add_title_slide(
             pitch_data.company_name, elevator_pitch)
         
         # Generate and add slides
-        slides = self._generate_slides(pitch_data , exec_summary)
-        for slide in slides:
-            self.presentation_builder.add_content_slide(slide)
+        slides = self._finish_slides(pitch_data, exec_summary, charts, render_futures)
+        with instrumentation.span("deck.add_slides", slides=len(slides)):
+            for slide in slides:
+                presentation_builder.add_content_slide(slide)
+        return presentation_builder
+    
+    def new_presentation_builder(self) -> "presentation_builder.PresentationBuilder":
+        return presentation_builder.PresentationBuilder(self.template_path, chart_mode=self.chart_mode)
+    
+    def iter_generate_pitch_deck(self, pitch_data: PitchDeckData) -> Iterator[GenerationEvent]:
+        # Same pipeline as generate_pitch_deck, but yields an event as each LLM
+        # token arrives, each chart finishes rendering and each slide is built
+        events = queue.Queue()
+        pitch_future, summary_future, charts, render_futures = self._start_generation(
+            pitch_data, lambda stage, token: events.put(GenerationEvent(stage, text=token)))
         
-        # Save presentation
-        output_path = f"pitch_deck_{pitch_data.company_name.lower().replace(' ', '_')}.pptx"
-        self.presentation_builder.save(output_path)
-        return output_path
+        # Tokens are queued before their future completes, so once both LLM
+        # futures are done an empty queue means every token has been yielded
+        pending_charts = dict(render_futures)
+        charts_end = time.monotonic() + CHART_RENDER_TIMEOUT
+        while not (pitch_future.done() and summary_future.done()) or pending_charts or not events.empty():
+            if time.monotonic() > charts_end:
+                # Stuck renders are left to the builder's own fallback
+                pending_charts.clear()
+            for name, future in list(pending_charts.items()):
+                if future.done():
+                    del pending_charts[name]
+                    image = None if future.exception() else future.result()
+                    yield GenerationEvent("chart_rendered", name=name, image=image)
+            try:
+                yield events.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        
+        elevator_pitch = pitch_future.result()
+        exec_summary = summary_future.result()
+        
+        slides = self._finish_slides(pitch_data, exec_summary, charts, render_futures)
+        total = len(slides) + 1
+        
+        presentation_builder = self.new_presentation_builder()
+        presentation_builder.add_title_slide(pitch_data.company_name, elevator_pitch)
+        yield GenerationEvent("slide_built", name=pitch_data.company_name, index=1, total=total)
+        for index, slide in enumerate(slides, start=2):
+            presentation_builder.add_content_slide(slide)
+            image = slide.visual_data.get("png") if slide.visual_data else None
+            yield GenerationEvent("slide_built", name=slide.title, image=image,
+                                  index=index, total=total)
+        
+        yield GenerationEvent("done", deck=presentation_builder.to_bytes())
+    
+    @staticmethod
+    def output_filename(pitch_data: PitchDeckData) -> str:
+        return f"pitch_deck_{pitch_data.company_name.lower().replace(' ', '_')}.pptx"
+    
+    def _build_charts(self, pitch_data: PitchDeckData) -> Dict[str, Any]:
+        # Charts only depend on the input data, not on the LLM output. Each one
+        # is a build-graph node, so unchanged charts keep their figure
+        node = self.build_graph.build
+        charts = {
+            "solution": node("chart.solution", pitch_data,
+                             lambda: apply_chart_layout(self.viz_generator.create_solution_diagram())),
+            "market": node("chart.market", pitch_data,
+                           lambda: apply_chart_layout(self._market_chart(pitch_data))),
+            "revenue": node("chart.revenue", pitch_data,
+                            lambda: apply_chart_layout(
+                                self.viz_generator.create_revenue_projection(pitch_data.revenue_model))),
+            "financials": node("chart.financials", pitch_data,
+                               lambda: apply_chart_layout(self.viz_generator.create_financial_forecast())),
+        }
+        # Large roadmaps come back as several pages: roadmap, roadmap_2, ...
+        # Roadmap pages go on timeline slides, which keep their own layout
+        roadmap_pages = node("chart.roadmap", pitch_data,
+                             lambda: self.viz_generator.create_roadmap_timelines(pitch_data.roadmap))
+        for i, page in enumerate(roadmap_pages):
+            charts["roadmap" if i == 0 else f"roadmap_{i + 1}"] = page
+        if self.scenarios is not None:
+            charts.update(node("chart.scenarios", pitch_data,
+                               lambda: self._scenario_charts(pitch_data), self.scenarios))
+        return charts
+    
+    def _market_chart(self, pitch_data: PitchDeckData):
+        tam, sam, som = market_segments(pitch_data.market_size, DEFAULT_MARKET_SPLIT)[0].tolist()
+        return self.viz_generator.create_market_size_chart({
+            'TAM': tam,
+            'SAM': sam,
+            'SOM': som
+        })
+    
+    def _scenario_charts(self, pitch_data: PitchDeckData) -> Dict[str, Any]:
+        charts = self.viz_generator.create_scenario_charts(project(self.scenarios, pitch_data.market_size))
+        for chart in charts.values():
+            if chart is not None:
+                apply_chart_layout(chart)
+        return charts
     
-    def _generate_slides(self, pitch_data: PitchDeckData, exec_summary: str) -> List[SlideContent]:
+    def _attach_rendered_charts(self, slides: List[SlideContent], charts: Dict[str, Any],
+                                render_futures: Dict[str, Any]):
+        rendered = {}
+        # One deadline for the whole batch, so a stuck renderer can't hang the deck
+        end = time.monotonic() + CHART_RENDER_TIMEOUT
+        for key, future in render_futures.items():
+            try:
+                rendered[id(charts[key])] = future.result(timeout=max(end - time.monotonic(), 0))
+            except FutureTimeoutError:
+                print(f"Error rendering chart '{key}': no result after {CHART_RENDER_TIMEOUT:.0f}s")
+            except Exception as e:
+                # The builder falls back to rendering the figure itself
+                print(f"Error rendering chart '{key}': {e}")
+        for slide in slides:
+            if slide.visual_data and id(slide.visual_data.get("chart")) in rendered:
+                slide.visual_data["png"] = rendered[id(slide.visual_data["chart"])]
+    
+    def _generate_slides(self, pitch_data: PitchDeckData, exec_summary: str,
+                         charts: Dict[str, Any] = None) -> List[SlideContent]:
         slides = []
     
         if "[**Specify" in exec_summary:
+            # Don't let the memo or the response cache hand back the same placeholder
+            self.build_graph.discard("executive_summary")
+            self.content_generator.forget_executive_summary(pitch_data)
             raise ValueError("AI failed to generate proper executive summary")
         
         if len(pitch_data.solution) < 50:
             raise ValueError("Solution description too vague")
         
+        if charts is None:
+            charts = self._build_charts(pitch_data)
+        
+        # Every slide is a build-graph node keyed on its input fields and the
+        # identity of its chart, so a rerun reuses the untouched ones
+        node = self.build_graph.build
+        
         # Problem slide
-        slides.append(SlideContent(
+        slides.append(node("slide.problem", pitch_data, lambda: SlideContent(
             title="The Problem",
             content=f"**Key Pain Points:**\n{pitch_data.problem_statement}",
             visual_type=VisualType.IMAGE,
             visual_data={"image": "path/to/problem_icon.png"}
-        ))
+        )))
         
         # Solution slide
-        slides.append(SlideContent(
+        slides.append(node("slide.solution", pitch_data, lambda: SlideContent(
             title="Our Solution",
             content=f"**{pitch_data.company_name}'s Innovation:**\n{pitch_data.solution}\n\n**Key Benefits:**\n- 50% cost savings vs competitors\n- 98% customer satisfaction",
             visual_type=VisualType.CHART,
-            visual_data={"chart": self.viz_generator.create_solution_diagram()}
-        ))
+            visual_data={"chart": charts["solution"]}
+        ), id(charts["solution"])))
         
         # Market size slide with visualization
-        market_chart = self.viz_generator.create_market_size_chart({
-            'TAM': pitch_data.market_size,
-            'SAM': pitch_data.market_size * 0.6,
-            'SOM': pitch_data.market_size * 0.3
-        })
-        slides.append(SlideContent(
+        slides.append(node("slide.market", pitch_data, lambda: SlideContent(
             title="Market Opportunity",
             content=f"**${pitch_data.market_size/1e9:.1f}B Total Addressable Market**\n22% CAGR projected (2024-2029)",
             visual_type=VisualType.CHART,
-            visual_data={"chart": market_chart}
-        ))
+            visual_data={"chart": charts["market"]}
+        ), id(charts["market"])))
         
         # Revenue projection slide  
-        rev_chart = self.viz_generator.create_revenue_projection(pitch_data.revenue_model)
-        slides.append(SlideContent(
+        slides.append(node("slide.business_model", pitch_data, lambda: SlideContent(
             title="Business Model",
             content="**Revenue Streams:**\n" + "\n".join(
                 [f"- {k}: {v}%" for k,v in pitch_data.revenue_model.items()]),
             visual_type=VisualType.CHART,
-            visual_data={"chart": rev_chart}
-        ))
-        
-        # Roadmap timeline slide
-        roadmap_chart = self.viz_generator.create_roadmap_timeline(pitch_data.roadmap)
-        slides.append(SlideContent(
-            title="Product Roadmap",
-            content="Key Milestones & Timeline",
-            visual_type=VisualType.TIMELINE,
-            visual_data={"chart": roadmap_chart}
-        ))
+            visual_data={"chart": charts["revenue"]}
+        ), id(charts["revenue"])))
+        
+        # Roadmap timeline slides, one per page
+        roadmap_pages = [charts[key] for key in charts if key.startswith("roadmap")]
+        slides.extend(node("slide.roadmap", pitch_data, lambda: [
+            SlideContent(
+                title="Product Roadmap" if i == 0 else f"Product Roadmap ({i + 1}/{len(roadmap_pages)})",
+                content="Key Milestones & Timeline",
+                visual_type=VisualType.TIMELINE,
+                visual_data={"chart": page}
+            )
+            for i, page in enumerate(roadmap_pages)
+        ], [id(page) for page in roadmap_pages]))
             
         # Team slide
         # slides.append(SlideContent(
@@ -96,11 +373,11 @@ class PitchDeckGenerator:
         # ))
         
         # Traction slide
-        slides.append(SlideContent(
+        slides.append(node("slide.traction", pitch_data, lambda: SlideContent(
             title="Traction & Validation",
             content=f"**Early Success:**\n{pitch_data.traction}\n\n" +
                     "**Key Metrics:**\n- 80% Pilot Retention\n- 4.9/5 Customer Rating"
-        ))
+        )))
         
         # Future outlook slide  
         # slides.append(SlideContent(
@@ -111,33 +388,63 @@ class PitchDeckGenerator:
         # ))
         
         # 7. Financials
-        slides.append(SlideContent(
+        slides.append(node("slide.financials", pitch_data, lambda: SlideContent(
             title="Financial Projections",
             content="3-Year Growth Outlook",
             visual_type=VisualType.CHART,
-            visual_data={"chart": self.viz_generator.create_financial_forecast()}
-        ))
+            visual_data={"chart": charts["financials"]}
+        ), id(charts["financials"])))
+        
+        # Sensitivity analysis
+        if "scenarios" in charts:
+            slides.extend(node("slide.scenarios", pitch_data, lambda: self._scenario_slides(charts),
+                               self.scenarios, id(charts["scenarios"])))
         
         # 8. Team
-        slides.append(SlideContent(
+        slides.append(node("slide.team", pitch_data, lambda: SlideContent(
             title="Leadership Team",
-            content="\n".join([f"- {m['name']} ({m['role']})" for m in pitch_data.team]),
+            content="\n".join([f"- {m.name} ({m.role})" for m in pitch_data.team]),
             visual_type=VisualType.IMAGE,
             visual_data={"image": "path/to/team_photo.png"}
-        ))
+        )))
         
         # Executive summary slide
-        slides.append(SlideContent(
+        slides.append(node("slide.executive_summary", pitch_data, lambda: SlideContent(
             title="Executive Summary",
             content= exec_summary
-        ))
+        ), exec_summary))
         
         # Conclusion slide
-        slides.append(SlideContent(
+        slides.append(node("slide.next_steps", pitch_data, lambda: SlideContent(
             title="Next Steps",
             content="**Investment Ask:** $2M Seed Round\n" +
                     "**Key Milestones:**\n- Expand to 3 new cities\n- Launch mobile app"
-        ))   
+        )))   
 
 
-        return slides
\ No newline at end of file
+        return slides
+    
+    def _scenario_slides(self, charts: Dict[str, Any]) -> List[SlideContent]:
+        scenario_names = ", ".join(self.scenarios.scenarios)
+        low, high, _ = self.scenarios.cagr_sweep
+        return [
+            SlideContent(
+                title="Growth Scenarios",
+                content=f"**{self.scenarios.years}-Year Outlook:** {scenario_names}",
+                visual_type=VisualType.CHART,
+                visual_data={"chart": charts["scenarios"]}
+            ),
+            SlideContent(
+                title="Sensitivity Analysis",
+                content=f"Revenue across {low:.0%}-{high:.0%} CAGR",
+                visual_type=VisualType.CHART,
+                visual_data={"chart": charts["sensitivity"]}
+            ),
+            SlideContent(
+                title="Market Capture Scenarios",
+                content="\n".join([f"- {name}: SAM {sam:.0%}, SOM {som:.0%} of TAM"
+                                   for name, (sam, som) in self.scenarios.market_splits.items()]),
+                visual_type=VisualType.CHART,
+                visual_data={"chart": charts["market_scenarios"]}
+            ),
+        ]
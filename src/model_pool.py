@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Tuple
+from config import MODEL_POOL_SIZE
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    waits: int = 0
+    wait_time: float = 0.0  # seconds spent blocked on the concurrency cap
+    in_use: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _create_model(**kwargs):
+    from camel.models import ModelFactory
+    return ModelFactory.create(**kwargs)
+
+
+# Pool of model backends keyed by platform, model type and config. Backends are
+# checked out exclusively and returned after use, so their HTTP clients are
+# reused across prompts. max_size caps concurrent checkouts across all keys.
+class ModelPool:
+
+    def __init__(self, max_size: int = MODEL_POOL_SIZE,
+                 factory: Callable[..., Any] = None):
+        self.max_size = max_size
+        self.stats = PoolStats()
+        self._factory = factory or _create_model
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, str], List[Any]] = {}
+
+    @staticmethod
+    def _key(model_platform, model_type, model_config_dict) -> Tuple[str, str, str]:
+        return (str(model_platform), str(model_type),
+                json.dumps(model_config_dict or {}, sort_keys=True, default=str))
+
+    @contextmanager
+    def acquire(self, model_platform, model_type, model_config_dict: Dict[str, Any]):
+        key = self._key(model_platform, model_type, model_config_dict)
+
+        start = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            self._slots.acquire()
+            with self._lock:
+                self.stats.waits += 1
+                self.stats.wait_time += time.perf_counter() - start
+
+        model = None
+        try:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    model = idle.pop()
+                    self.stats.hits += 1
+                else:
+                    self.stats.misses += 1
+                self.stats.in_use += 1
+
+            if model is None:
+                model = self._factory(
+                    model_platform=model_platform,
+                    model_type=model_type,
+                    model_config_dict=model_config_dict
+                )
+            yield model
+        finally:
+            with self._lock:
+                self.stats.in_use -= 1
+                if model is not None:
+                    self._idle.setdefault(key, []).append(model)
+            self._slots.release()
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    # Module-level singleton so every Streamlit session in the process shares it
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ModelPool()
+    return _pool
+
+
+def set_model_pool(pool: ModelPool):
+    # Swap the shared pool, e.g. for one backed by a local stub model
+    global _pool
+    with _pool_lock:
+        _pool = pool
@@ -1,6 +1,7 @@
 # models.py
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from datetime import date
+from typing import Dict, Optional, Any, Tuple
 from enum import Enum
 
 class VisualType(Enum):
@@ -16,14 +17,40 @@ class SlideContent:
     visual_type: Optional[VisualType] = None
     visual_data: Optional[Dict[str, Any]] = None
     
-@dataclass
+# Input records are validated and parsed once (validation.validate_pitch_data);
+# slotted, frozen instances keep per-record memory low in batch runs
+
+@dataclass(frozen=True, slots=True)
+class Milestone:
+    milestone: str
+    start_date: date
+    end_date: Optional[date] = None
+    lane: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class TeamMember:
+    name: str
+    role: str
+
+@dataclass(frozen=True, slots=True)
 class PitchDeckData:
     company_name: str
     problem_statement: str
     solution: str
     market_size: float
     revenue_model: Dict[str, float]
-    roadmap: List[Dict[str, Any]]
-    team: List[Dict[str, str]]
+    roadmap: Tuple[Milestone, ...]
+    team: Tuple[TeamMember, ...]
     traction: str
-    future_outlook: str
\ No newline at end of file
+    future_outlook: str
+
+@dataclass
+class GenerationEvent:
+    # Emitted by PitchDeckGenerator.iter_generate_pitch_deck as each stage finishes
+    stage: str  # "pitch_token", "summary_token", "chart_rendered", "slide_built" or "done"
+    text: Optional[str] = None
+    name: Optional[str] = None
+    image: Optional[bytes] = None
+    index: Optional[int] = None
+    total: Optional[int] = None
+    deck: Optional[bytes] = None
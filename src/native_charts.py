@@ -0,0 +1,98 @@
+# native_charts.py
+# Maps simple Plotly figures onto native PowerPoint charts so they can be
+# inserted without rasterizing. Anything without a native equivalent
+# (indicators, heatmaps, timelines) is left to the image path.
+from typing import Any, List, Optional
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.util import Pt
+
+
+def _chart_type(fig) -> Optional[Any]:
+    traces = fig.data
+    if not traces:
+        return None
+    kinds = {trace.type for trace in traces}
+    if kinds == {"bar"} and all(t.orientation in (None, "v") and t.base is None for t in traces):
+        return XL_CHART_TYPE.COLUMN_CLUSTERED
+    if kinds == {"pie"} and len(traces) == 1:
+        return XL_CHART_TYPE.PIE
+    if kinds == {"scatter"} and all("lines" in (t.mode or "lines") for t in traces):
+        return XL_CHART_TYPE.LINE_MARKERS
+    return None
+
+
+def supports(fig) -> bool:
+    return fig is not None and _chart_type(fig) is not None
+
+
+def _rgb(color: Any) -> Optional[RGBColor]:
+    if isinstance(color, str) and color.startswith("#") and len(color) == 7:
+        return RGBColor.from_string(color[1:].upper())
+    return None
+
+
+def _as_list(values) -> List[Any]:
+    return list(values) if values is not None else []
+
+
+def _chart_data(fig, chart_type) -> CategoryChartData:
+    data = CategoryChartData()
+    if chart_type == XL_CHART_TYPE.PIE:
+        trace = fig.data[0]
+        data.categories = [str(label) for label in _as_list(trace.labels)]
+        data.add_series(trace.name or "Series 1", [float(v) for v in _as_list(trace.values)])
+        return data
+    data.categories = [str(x) for x in _as_list(fig.data[0].x)]
+    for i, trace in enumerate(fig.data):
+        data.add_series(trace.name or f"Series {i + 1}", [float(y) for y in _as_list(trace.y)])
+    return data
+
+
+def _apply_colors(chart, fig, chart_type):
+    plot = chart.plots[0]
+    if chart_type == XL_CHART_TYPE.PIE:
+        colors = _as_list(fig.data[0].marker.colors)
+        for point, color in zip(plot.series[0].points, colors):
+            if _rgb(color):
+                point.format.fill.solid()
+                point.format.fill.fore_color.rgb = _rgb(color)
+        return
+    for series, trace in zip(plot.series, fig.data):
+        if chart_type == XL_CHART_TYPE.LINE_MARKERS:
+            color = _rgb(trace.line.color)
+            if color:
+                series.format.line.color.rgb = color
+            continue
+        color = trace.marker.color
+        if isinstance(color, str) and _rgb(color):
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = _rgb(color)
+        elif color is not None and not isinstance(color, str):
+            # Per-bar colors, e.g. the TAM/SAM/SOM chart
+            for point, point_color in zip(series.points, color):
+                if _rgb(point_color):
+                    point.format.fill.solid()
+                    point.format.fill.fore_color.rgb = _rgb(point_color)
+
+
+def add_native_chart(slide, fig, left, top, width, height) -> bool:
+    # Returns False when the figure has no native equivalent
+    chart_type = _chart_type(fig)
+    if chart_type is None:
+        return False
+    graphic = slide.shapes.add_chart(chart_type, left, top, width, height,
+                                     _chart_data(fig, chart_type))
+    chart = graphic.chart
+    title = fig.layout.title.text
+    chart.has_title = bool(title)
+    if title:
+        chart.chart_title.text_frame.text = title
+        chart.chart_title.text_frame.paragraphs[0].font.size = Pt(18)
+    chart.has_legend = chart_type == XL_CHART_TYPE.PIE or len(fig.data) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    _apply_colors(chart, fig, chart_type)
+    return True
@@ -1,29 +1,51 @@
 import os
+import threading
+from io import BytesIO
+from typing import IO, Dict, Optional, Tuple, Union
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
 from models import SlideContent, VisualType
+from config import CHART_MODE
+from native_charts import add_native_chart
+from chart_renderer import apply_chart_layout, get_chart_renderer
+import instrumentation
+from instrumentation import traced
+
+# Serialized, already-themed base presentations keyed by template path and mtime.
+# Each builder opens its own copy from these bytes instead of re-reading and
+# re-configuring the template file for every deck.
+_template_cache: Dict[Tuple[Optional[str], float], bytes] = {}
+_template_lock = threading.Lock()
+
 
 class PresentationBuilder:
-    def __init__(self , template_path: str = None):
+    def __init__(self , template_path: str = None, chart_mode: str = CHART_MODE):
+        self.prs = Presentation(BytesIO(self._template_bytes(template_path)))
+        self.chart_mode = chart_mode
         
+    @classmethod
+    def _template_bytes(cls, template_path: Optional[str]) -> bytes:
         if template_path and os.path.exists(template_path):
-            self.prs = Presentation(template_path)
+            key = (template_path, os.path.getmtime(template_path))
         else:
-            self.prs = Presentation()
-            
-        self.prs.slide_width = Inches(16)
-        self.prs.slide_height = Inches(9)
-        self._apply_theme()
+            key = (None, 0.0)
+        with _template_lock:
+            if key not in _template_cache:
+                prs = Presentation(template_path) if key[0] else Presentation()
+                prs.slide_width = Inches(16)
+                prs.slide_height = Inches(9)
+                for slide in prs.slides:
+                    cls._set_slide_background(slide)
+                buffer = BytesIO()
+                prs.save(buffer)
+                _template_cache[key] = buffer.getvalue()
+            return _template_cache[key]
         
-    def _apply_theme(self):
-        # Define a modern color palette and background for all slides
-        for slide in self.prs.slides:
-            self._set_slide_background(slide)
-        
-    def _set_slide_background(self, slide):
+    @staticmethod
+    def _set_slide_background(slide):
         fill = slide.background.fill
         fill.solid()
         fill.fore_color.rgb = RGBColor(245, 245, 245)  # White background
@@ -39,6 +61,7 @@ class PresentationBuilder:
     #         fill.solid()
     #         fill.fore_color.rgb = RGBColor(255, 255, 255)  # White background
         
+    @traced("pptx.add_title_slide")
     def add_title_slide(self, company_name: str, subtitle: str):
         slide_layout = self.prs.slide_layouts[0]
         slide = self.prs.slides.add_slide(slide_layout)
@@ -58,6 +81,7 @@ class PresentationBuilder:
         subtitle_placeholder.text_frame.paragraphs[0].font.color.rgb = RGBColor(100, 100, 100)  # Gray
         subtitle_placeholder.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
 
+    @traced("pptx.add_content_slide")
     def add_content_slide(self, content: SlideContent):
         blank_layout = self.prs.slide_layouts[6] if len(self.prs.slide_layouts) > 6 else self.prs.slide_layouts[-1]
         slide = self.prs.slides.add_slide(blank_layout)
@@ -95,40 +119,48 @@ class PresentationBuilder:
             elif content.visual_type == VisualType.IMAGE:
                 self._add_image(slide, content.visual_data, visual_left, visual_top, visual_width)
                 
+    def _add_prerendered(self, slide, visual_data, visual_left, visual_top, visual_width):
+        # PNG bytes produced ahead of time by the batch ChartRenderer
+        try:
+            slide.shapes.add_picture(BytesIO(visual_data['png']), visual_left, visual_top, width=visual_width)
+        except Exception as e:
+            print(f"Error adding rendered chart to slide: {e}")
+                
+    @traced("pptx.add_native_chart")
+    def _add_native(self, slide, visual_data, visual_left, visual_top, visual_width) -> bool:
+        # Native charts keep the 800x600 aspect ratio of the rendered images
+        if self.chart_mode != "native" or visual_data.get('chart') is None:
+            return False
+        return add_native_chart(slide, visual_data['chart'], visual_left, visual_top,
+                                visual_width, int(visual_width * 3 / 4))
+                
+    @traced("pptx.add_chart")
     def _add_chart(self, slide, visual_data, visual_left, visual_top, visual_width):
-        if 'chart' in visual_data and visual_data['chart'] is not None: 
-            chart_filepath = "temp_chart.png" 
-            chart = visual_data['chart']
-            chart.update_layout(
-                width=800,
-                height=600,
-                margin=dict(l=20, r=20, t=40, b=20),
-                title_font_size=24,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            
-            chart.write_image(chart_filepath)
+        if self._add_native(slide, visual_data, visual_left, visual_top, visual_width):
+            return
+        if visual_data.get('png'):
+            self._add_prerendered(slide, visual_data, visual_left, visual_top, visual_width)
+        elif 'chart' in visual_data and visual_data['chart'] is not None: 
+            chart = apply_chart_layout(visual_data['chart'])
+            image = BytesIO(get_chart_renderer().render(chart))
             try:
-                slide.shapes.add_picture(chart_filepath, visual_left, visual_top, width=visual_width)
+                slide.shapes.add_picture(image, visual_left, visual_top, width=visual_width)
             except Exception as e:
                 print(f"Error adding chart to slide: {e}") 
-            finally:
-                if os.path.exists(chart_filepath):
-                    os.remove(chart_filepath)  
 
+    @traced("pptx.add_timeline")
     def _add_timeline(self, slide, visual_data, visual_left, visual_top, visual_width):
-        if 'chart' in visual_data and visual_data['chart'] is not None: 
-            timeline_filepath = "temp_timeline.png"
+        if self._add_native(slide, visual_data, visual_left, visual_top, visual_width):
+            return
+        if visual_data.get('png'):
+            self._add_prerendered(slide, visual_data, visual_left, visual_top, visual_width)
+        elif 'chart' in visual_data and visual_data['chart'] is not None: 
             timeline_chart = visual_data['chart']
-            timeline_chart.write_image(timeline_filepath)
+            image = BytesIO(get_chart_renderer().render(timeline_chart))
             try:
-                slide.shapes.add_picture(timeline_filepath, visual_left, visual_top, width=visual_width)
+                slide.shapes.add_picture(image, visual_left, visual_top, width=visual_width)
             except Exception as e:
                 print(f"Error adding timeline to slide: {e}") 
-            finally:
-                if os.path.exists(timeline_filepath):
-                    os.remove(timeline_filepath)
       
     def _add_image(self, slide, visual_data, left, top, width):
         # shape = slide.shapes.add_shape(
@@ -150,5 +182,24 @@ class PresentationBuilder:
         except Exception as e:
             print("Error adding image:", e)
           
-    def save(self, filename: str):
-        self.prs.save(filename)
\ No newline at end of file
+    def save(self, target: Union[str, IO[bytes]]):
+        # Accepts a path or any writable binary buffer such as BytesIO. The
+        # presentation is released afterwards; use a new builder per deck.
+        if self.prs is None:
+            raise RuntimeError("PresentationBuilder has already been saved")
+        try:
+            with instrumentation.span("pptx.save"):
+                self.prs.save(target)
+        finally:
+            self.close()
+        if instrumentation.enabled():
+            size = os.path.getsize(target) if isinstance(target, str) else target.tell()
+            instrumentation.count("pptx.bytes", size)
+
+    def close(self):
+        self.prs = None
+
+    def to_bytes(self) -> bytes:
+        buffer = BytesIO()
+        self.save(buffer)
+        return buffer.getvalue()
\ No newline at end of file
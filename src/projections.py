@@ -0,0 +1,72 @@
+# projections.py
+# Vectorized growth scenarios and market splits. Every scenario, CAGR sweep
+# step and year is computed as one NumPy array operation, so adding scenarios
+# or sensitivity slides adds rows, not Python loops. numpy is imported inside
+# the functions so importing this module stays cheap.
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# (SAM, SOM) as shares of TAM
+DEFAULT_MARKET_SPLIT = (0.6, 0.3)
+
+
+@dataclass
+class ScenarioConfig:
+    base_revenue: float = 1.2  # first projected year, millions USD
+    start_year: int = 2024
+    years: int = 5
+    scenarios: Dict[str, float] = field(
+        default_factory=lambda: {"Bear": 0.6, "Base": 1.2, "Bull": 1.8})  # CAGR per scenario
+    cagr_sweep: Tuple[float, float, int] = (0.2, 2.0, 10)  # low, high, steps
+    market_splits: Dict[str, Tuple[float, float]] = field(
+        default_factory=lambda: {"Conservative": (0.4, 0.1), "Base": DEFAULT_MARKET_SPLIT,
+                                 "Aggressive": (0.8, 0.5)})
+
+
+@dataclass
+class ScenarioProjection:
+    years: "np.ndarray"              # (years,)
+    scenario_names: List[str]
+    scenario_revenue: "np.ndarray"   # (scenarios, years)
+    sweep_cagrs: "np.ndarray"        # (steps,)
+    sweep_revenue: "np.ndarray"      # (steps, years)
+    split_names: List[str]
+    market_segments: "np.ndarray"    # (splits, 3) TAM/SAM/SOM
+
+
+def project_revenue(base_revenue, cagrs, years: int):
+    # Broadcasts (n, 1) growth rates against (1, years) exponents
+    import numpy as np
+    cagrs = np.asarray(cagrs, dtype=float).reshape(-1, 1)
+    exponents = np.arange(years, dtype=float).reshape(1, -1)
+    return np.asarray(base_revenue, dtype=float).reshape(-1, 1) * (1.0 + cagrs) ** exponents
+
+
+def market_segments(market_size: float, splits) -> "np.ndarray":
+    # splits: (n, 2) SAM/SOM shares -> (n, 3) TAM/SAM/SOM values
+    import numpy as np
+    shares = np.asarray(splits, dtype=float).reshape(-1, 2)
+    shares = np.hstack([np.ones((shares.shape[0], 1)), shares])
+    return market_size * shares
+
+
+def project(config: ScenarioConfig, market_size: float) -> ScenarioProjection:
+    import numpy as np
+    low, high, steps = config.cagr_sweep
+    sweep_cagrs = np.linspace(low, high, steps)
+    # Scenarios and the sensitivity sweep share one matrix computation
+    all_cagrs = np.concatenate([np.fromiter(config.scenarios.values(), dtype=float), sweep_cagrs])
+    revenue = project_revenue(config.base_revenue, all_cagrs, config.years)
+    n_scenarios = len(config.scenarios)
+    return ScenarioProjection(
+        years=config.start_year + np.arange(config.years),
+        scenario_names=list(config.scenarios),
+        scenario_revenue=revenue[:n_scenarios],
+        sweep_cagrs=sweep_cagrs,
+        sweep_revenue=revenue[n_scenarios:],
+        split_names=list(config.market_splits),
+        market_segments=market_segments(market_size, list(config.market_splits.values())),
+    )
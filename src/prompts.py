@@ -0,0 +1,156 @@
+# prompts.py
+# Builds the LLM prompts within a token budget. Tokens are counted locally
+# (tiktoken when it and its encoding are available, ~4 characters per token
+# otherwise), oversized user fields are truncated, and every prompt is sent once
+# as a short system message plus the user message.
+import math
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Sequence
+from config import PROMPT_FIELD_TOKENS, PROMPT_MAX_TOKENS
+from models import Milestone, PitchDeckData, TeamMember
+
+SYSTEM_MESSAGE = ("You are an expert startup pitch writer. Write concise, persuasive, "
+                  "investor-ready copy using only the facts provided.")
+CHARS_PER_TOKEN = 4
+ELLIPSIS = " [...]"
+# Fields are never cut below this when fitting the total budget
+MIN_FIELD_TOKENS = 32
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Not installed, or the encoding can't be downloaded
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    budget = max(max_tokens - count_tokens(ELLIPSIS), 1)
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text)[:budget])
+    else:
+        cut = text[:budget * CHARS_PER_TOKEN]
+    # Prefer ending on a word boundary
+    if " " in cut[len(cut) // 2:]:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip() + ELLIPSIS
+
+
+def fit_fields(fields: Dict[str, str], field_tokens: int, max_tokens: int) -> Dict[str, str]:
+    # Caps every field, then shrinks the largest until the total fits
+    fitted = {name: truncate_to_tokens(value, field_tokens) for name, value in fields.items()}
+    sizes = {name: count_tokens(value) for name, value in fitted.items()}
+    while sum(sizes.values()) > max_tokens:
+        name = max(sizes, key=sizes.get)
+        if sizes[name] <= MIN_FIELD_TOKENS:
+            break
+        fitted[name] = truncate_to_tokens(fitted[name], max(int(sizes[name] * 0.75), MIN_FIELD_TOKENS))
+        sizes[name] = count_tokens(fitted[name])
+    return fitted
+
+
+@dataclass(frozen=True)
+class Prompt:
+    name: str
+    user: str
+    system: str = SYSTEM_MESSAGE
+
+    @property
+    def input_tokens(self) -> int:
+        return count_tokens(self.system) + count_tokens(self.user)
+
+    def messages(self) -> List[Dict[str, str]]:
+        return [{"role": "system", "content": self.system},
+                {"role": "user", "content": self.user}]
+
+
+@dataclass
+class TokenUsage:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, input_tokens: int, output_tokens: int):
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def format_revenue_model(revenue_model: Dict[str, Any]) -> str:
+    # Unit-neutral: the form takes amounts, not shares; the slide does the formatting
+    return ", ".join(f"{name}: {value}" for name, value in revenue_model.items())
+
+
+def format_roadmap(roadmap: Sequence[Milestone], limit: int = 2) -> str:
+    highlights = []
+    for item in roadmap[:limit]:
+        when = f"{item.start_date:%Y-%m}"
+        if item.end_date:
+            when += f" to {item.end_date:%Y-%m}"
+        highlights.append(f"{item.milestone} ({when})")
+    return "; ".join(highlights)
+
+
+def describe_team(team: Sequence[TeamMember]) -> str:
+    if not team:
+        return "Experienced team"
+    return f"{len(team)} members with {team[0].role} leadership"
+
+
+def elevator_pitch_prompt(pitch_data: PitchDeckData, field_tokens: int = PROMPT_FIELD_TOKENS,
+                          max_tokens: int = PROMPT_MAX_TOKENS) -> Prompt:
+    fields = fit_fields({
+        "company": pitch_data.company_name,
+        "problem": pitch_data.problem_statement,
+        "solution": pitch_data.solution,
+    }, field_tokens, max_tokens)
+    return Prompt("elevator_pitch", f"""Create a compelling elevator pitch for {fields['company']}.
+Problem: {fields['problem']}
+Solution: {fields['solution']}
+Market Size: ${pitch_data.market_size:,.2f}""")
+
+
+def executive_summary_prompt(pitch_data: PitchDeckData, field_tokens: int = PROMPT_FIELD_TOKENS,
+                             max_tokens: int = PROMPT_MAX_TOKENS) -> Prompt:
+    fields = fit_fields({
+        "company": pitch_data.company_name,
+        "problem": pitch_data.problem_statement,
+        "solution": pitch_data.solution,
+        "revenue": format_revenue_model(pitch_data.revenue_model),
+        "traction": pitch_data.traction,
+        "roadmap": format_roadmap(pitch_data.roadmap),
+    }, field_tokens, max_tokens)
+    return Prompt("executive_summary", f"""Create a concise executive summary for {fields['company']} covering:
+- Problem: {fields['problem']}
+- Solution: {fields['solution']}
+- Market Size: ${pitch_data.market_size:,.2f}
+- Revenue Model: {fields['revenue']}
+- Key Traction: {fields['traction']}
+- Roadmap Highlights: {fields['roadmap']}
+- Team Strength: {describe_team(pitch_data.team)}""")
@@ -0,0 +1,27 @@
+import threading
+from cache import LRUCache, SQLiteCache, TieredCache, stable_hash
+from config import (Config, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_PATH,
+                    RESPONSE_CACHE_DISK_SIZE)
+
+
+def response_cache_key(prompt: str, config: Config) -> str:
+    return stable_hash(prompt, str(config.model_platform), str(config.model_type),
+                       config.model_config_dict)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> TieredCache:
+    # Shared by every AIContentGenerator in the process
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk = None
+                if RESPONSE_CACHE_PATH:
+                    disk = SQLiteCache(RESPONSE_CACHE_PATH, max_entries=RESPONSE_CACHE_DISK_SIZE,
+                                       ttl=RESPONSE_CACHE_TTL)
+                _cache = TieredCache(LRUCache(RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL), disk)
+    return _cache
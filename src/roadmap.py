@@ -0,0 +1,92 @@
+# roadmap.py
+# Sorts and pages roadmap milestones (dates are parsed once, by validation) so
+# timeline rendering stays bounded: at most MAX_ROWS_PER_PAGE bars per figure and, past MAX_PAGES of
+# individual milestones, one bar per quarter (and lane), then per year.
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+from models import Milestone
+
+MAX_ROWS_PER_PAGE = 15
+MAX_PAGES = 3
+
+
+@dataclass
+class TimelineRow:
+    label: str
+    start: date
+    end: date
+    lane: Optional[str] = None
+    count: int = 1
+
+
+@dataclass
+class TimelinePage:
+    rows: List[TimelineRow] = field(default_factory=list)
+
+
+def parse_milestones(milestones: Iterable[Milestone]) -> List[TimelineRow]:
+    rows = []
+    for m in milestones:
+        start = m.start_date
+        end = m.end_date or start
+        if end <= start:
+            end = start + timedelta(days=1)
+        rows.append(TimelineRow(label=m.milestone, start=start, end=end, lane=m.lane))
+    rows.sort(key=lambda r: (r.start, r.end))
+    return rows
+
+
+def quarter_of(d: date) -> date:
+    return date(d.year, 3 * ((d.month - 1) // 3) + 1, 1)
+
+
+def bucket_rows(rows: List[TimelineRow], by_year: bool = False,
+                by_lane: bool = True) -> List[TimelineRow]:
+    # One row per (quarter or year, lane) spanning all milestones that start in it
+    buckets: Dict[tuple, TimelineRow] = {}
+    for row in rows:
+        period = date(row.start.year, 1, 1) if by_year else quarter_of(row.start)
+        lane = row.lane if by_lane else None
+        key = (period, lane)
+        bucket = buckets.get(key)
+        if bucket is None:
+            label = str(period.year) if by_year else f"{period.year} Q{(period.month - 1) // 3 + 1}"
+            if lane:
+                label += f" · {lane}"
+            buckets[key] = TimelineRow(label=label, start=row.start, end=row.end,
+                                       lane=lane, count=row.count)
+        else:
+            bucket.end = max(bucket.end, row.end)
+            bucket.count += row.count
+    return sorted(buckets.values(), key=lambda r: (r.start, r.lane or ""))
+
+
+def paginate(rows: List[TimelineRow], rows_per_page: int = MAX_ROWS_PER_PAGE,
+             max_pages: int = MAX_PAGES) -> List[TimelinePage]:
+    # Coarser and coarser until the rows fit: quarters, years, years across all
+    # lanes, and finally evenly sized runs of consecutive years
+    limit = rows_per_page * max_pages
+    if len(rows) > limit:
+        rows = bucket_rows(rows)
+    if len(rows) > limit:
+        rows = bucket_rows(rows, by_year=True)
+    if len(rows) > limit:
+        rows = bucket_rows(rows, by_year=True, by_lane=False)
+    if len(rows) > limit:
+        rows = merge_rows(rows, limit)
+    return [TimelinePage(rows[i:i + rows_per_page])
+            for i in range(0, len(rows), rows_per_page)] or [TimelinePage()]
+
+
+def merge_rows(rows: List[TimelineRow], count: int) -> List[TimelineRow]:
+    # Splits sorted rows into `count` consecutive runs, one row per run
+    size = -(-len(rows) // count)
+    merged = []
+    for i in range(0, len(rows), size):
+        run = rows[i:i + size]
+        first, last = run[0].start.year, max(r.end for r in run).year
+        merged.append(TimelineRow(label=str(first) if first == last else f"{first}-{last}",
+                                  start=run[0].start, end=max(r.end for r in run),
+                                  count=sum(r.count for r in run)))
+    return merged
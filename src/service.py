@@ -0,0 +1,309 @@
+# service.py
+# Asyncio HTTP entry point for deck generation, alongside the Streamlit app.
+#
+#   python service.py --port 8080 --llm-workers 8 --cpu-workers 4 --queue-size 32
+#
+#   POST /decks              PitchDeckData JSON -> .pptx bytes
+#   POST /decks?async=1      PitchDeckData JSON -> 202 {"job_id": ...}
+#   GET  /jobs/<id>          job status
+#   GET  /jobs/<id>/deck     .pptx bytes once the job is done
+#   GET  /health             queue depth, worker and coalescing stats
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from ai_content_generator import AIContentGenerator
+from cache import stable_hash
+from chart_renderer import ChartRenderer
+from config import LLM_BREAKER_RESET
+from llm_scheduler import CircuitOpenError, LLMTimeoutError
+from main_generator import PitchDeckGenerator, warm_up
+from models import PitchDeckData
+from validation import PitchDataValidationError, validate_pitch_data
+
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+MAX_BODY_BYTES = 1 << 20
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    key: str
+    pitch_data: PitchDeckData
+    future: asyncio.Future
+    status: str = "queued"
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"job_id": self.id, "status": self.status, "error": self.error,
+                "created": self.created, "finished": self.finished}
+
+
+class DeckService:
+    def __init__(self, llm_workers: int = 8, cpu_workers: int = None, queue_size: int = 32,
+                 max_finished_jobs: int = 256):
+        cpu_workers = cpu_workers or min(4, os.cpu_count() or 1)
+        # LLM-bound work: the content generator's thread pool, sized for
+        # concurrent Gemini round trips. CPU-bound work: chart rasterization in
+        # the renderer's process pool plus pptx assembly on its own threads.
+        self.content_generator = AIContentGenerator(max_workers=llm_workers * 2)
+        self.chart_renderer = ChartRenderer(max_workers=cpu_workers)
+        self.cpu_pool = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="deck-cpu")
+        self.llm_workers = llm_workers
+        self.queue_size = queue_size
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.coalesced = 0
+        self._inflight: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+
+    def _generator(self) -> PitchDeckGenerator:
+        generator = PitchDeckGenerator(content_generator=self.content_generator)
+        generator.chart_renderer = self.chart_renderer
+        return generator
+
+    async def start(self):
+        # Pay for the deferred imports once, before any deck runs on the pools
+        await asyncio.get_running_loop().run_in_executor(self.cpu_pool, warm_up, False)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # One worker per deck allowed in flight; each spends most of its time
+        # awaiting the LLM pool
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.llm_workers)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self.content_generator.shutdown()
+        self.chart_renderer.shutdown()
+        self.cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, pitch_data: PitchDeckData) -> Job:
+        # Identical payloads share one job while it is queued or running
+        key = stable_hash(asdict(pitch_data))
+        job = self._inflight.get(key)
+        if job is not None:
+            self.coalesced += 1
+            return job
+        if self._queue.full():
+            raise QueueFullError("Deck queue is full, retry later")
+        job = Job(id=uuid.uuid4().hex, key=key, pitch_data=pitch_data,
+                  future=asyncio.get_running_loop().create_future())
+        self._inflight[key] = job
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                deck = await self._build(job.pitch_data)
+                job.status = "done"
+                job.future.set_result(deck)
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                job.future.set_exception(e)
+                # Waiters may have gone away; don't log "exception never retrieved"
+                job.future.exception()
+            finally:
+                job.finished = time.time()
+                self._inflight.pop(job.key, None)
+                self._queue.task_done()
+                self._evict_finished()
+
+    async def _build(self, pitch_data: PitchDeckData) -> bytes:
+        loop = asyncio.get_running_loop()
+        generator = self._generator()
+        # Start both prompts before building the charts so they overlap
+        llm = asyncio.gather(self.content_generator.agenerate_elevator_pitch(pitch_data),
+                             self.content_generator.agenerate_executive_summary(pitch_data))
+        try:
+            charts, render_futures = await loop.run_in_executor(
+                self.cpu_pool, generator.prepare_charts, pitch_data)
+        except Exception:
+            llm.cancel()
+            raise
+        elevator_pitch, exec_summary = await llm
+
+        def assemble() -> bytes:
+            return generator.assemble_pitch_deck(
+                pitch_data, elevator_pitch, exec_summary, charts, render_futures).to_bytes()
+
+        return await loop.run_in_executor(self.cpu_pool, assemble)
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "in_flight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "llm_workers": self.llm_workers,
+            "cpu_workers": self.cpu_pool._max_workers,
+            "model_pool": self.content_generator.model_pool.stats.as_dict(),
+        }
+
+    # HTTP handling
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status, headers, body = await self._dispatch(reader)
+        except Exception as e:
+            status, headers, body = _json_response(500, {"error": str(e)})
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                f"Content-Length: {len(body)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        if not request_line:
+            return _json_response(400, {"error": "Empty request"})
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            return _json_response(400, {"error": "Malformed request line"})
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return _json_response(400, {"error": "Invalid Content-Length"})
+        if length < 0:
+            return _json_response(400, {"error": "Invalid Content-Length"})
+        if length > MAX_BODY_BYTES:
+            return _json_response(413, {"error": "Request body too large"})
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            return _json_response(400, {"error": "Request body shorter than Content-Length"})
+
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"] and method == "GET":
+            return _json_response(200, self.stats())
+        if parts == ["decks"]:
+            if method != "POST":
+                return _json_response(405, {"error": "Use POST"})
+            query = parse_qs(url.query)
+            return await self._create_deck(body, query.get("async", ["0"])[0] in ("1", "true"))
+        if len(parts) >= 2 and parts[0] == "jobs" and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return _json_response(404, {"error": "Unknown job"})
+            if len(parts) == 2:
+                return _json_response(200, job.as_dict())
+            if parts[2:] == ["deck"]:
+                if job.status != "done":
+                    return _json_response(409, job.as_dict())
+                return _deck_response(job)
+        return _json_response(404, {"error": "Not found"})
+
+    async def _create_deck(self, body: bytes, run_async: bool) -> Tuple[int, Dict[str, str], bytes]:
+        # Validated before the job is queued, so bad input never costs an LLM call
+        try:
+            record = json.loads(body or b"{}")
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            pitch_data = validate_pitch_data(record)
+        except PitchDataValidationError as e:
+            return _json_response(400, {"error": "Invalid PitchDeckData", "errors": e.errors})
+        except ValueError as e:
+            return _json_response(400, {"error": f"Invalid PitchDeckData: {e}"})
+        try:
+            job = self.submit(pitch_data)
+        except QueueFullError as e:
+            status, headers, payload = _json_response(503, {"error": str(e)})
+            headers["Retry-After"] = "5"
+            return status, headers, payload
+        if run_async:
+            return _json_response(202, job.as_dict())
+        try:
+            await asyncio.shield(job.future)
+        except CircuitOpenError:
+            status, headers, payload = _json_response(503, job.as_dict())
+            headers["Retry-After"] = str(int(LLM_BREAKER_RESET))
+            return status, headers, payload
+        except LLMTimeoutError:
+            return _json_response(504, job.as_dict())
+        except Exception:
+            return _json_response(500, job.as_dict())
+        return _deck_response(job)
+
+
+def _json_response(status: int, payload) -> Tuple[int, Dict[str, str], bytes]:
+    return status, {"Content-Type": "application/json"}, json.dumps(payload).encode("utf-8")
+
+
+def _deck_response(job: Job) -> Tuple[int, Dict[str, str], bytes]:
+    filename = PitchDeckGenerator.output_filename(job.pitch_data)
+    return 200, {"Content-Type": PPTX_MIME,
+                 "Content-Disposition": f'attachment; filename="{filename}"',
+                 "X-Job-Id": job.id}, job.future.result()
+
+
+async def serve(host: str, port: int, service: DeckService):
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving pitch decks on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pitch deck HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--llm-workers", type=int, default=8,
+                        help="decks generated concurrently (LLM-bound)")
+    parser.add_argument("--cpu-workers", type=int, default=None,
+                        help="chart render and pptx assembly workers (CPU-bound)")
+    parser.add_argument("--queue-size", type=int, default=32,
+                        help="queued decks before new requests get 503")
+    args = parser.parse_args(argv)
+    service = DeckService(llm_workers=args.llm_workers, cpu_workers=args.cpu_workers,
+                          queue_size=args.queue_size)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# validation.py
+# Parses and type-checks a raw pitch record (form input, JSONL/CSV row or HTTP
+# body) into a PitchDeckData before any LLM call or chart is paid for. Every
+# problem is collected, so one error lists everything that needs fixing.
+import json
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from models import Milestone, PitchDeckData, TeamMember
+
+JSON_FIELDS = ("revenue_model", "roadmap", "team")
+REQUIRED_TEXT = ("company_name", "problem_statement", "solution")
+OPTIONAL_TEXT = ("traction", "future_outlook")
+# Shorter solutions are rejected by the deck generator
+MIN_SOLUTION_LENGTH = 50
+
+
+class PitchDataValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def parse_date(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    # "2024-03" means the first of the month
+    if len(text) == 7:
+        text += "-01"
+    return date.fromisoformat(text[:10])
+
+
+class _Validator:
+    def __init__(self, record: Mapping[str, Any]):
+        self.record = record
+        self.errors: List[str] = []
+
+    def error(self, where: str, message: str):
+        self.errors.append(f"{where}: {message}")
+
+    def raw(self, name: str) -> Any:
+        value = self.record.get(name)
+        # CSV cells and form text areas hold the nested structures as JSON strings
+        if name in JSON_FIELDS and isinstance(value, str):
+            if not value.strip():
+                return None
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError as e:
+                self.error(name, f"invalid JSON ({e.msg} at line {e.lineno} column {e.colno})")
+                return None
+        return value
+
+    def text(self, name: str, required: bool) -> str:
+        value = self.record.get(name)
+        if value is None:
+            value = ""
+        if not isinstance(value, str):
+            self.error(name, f"expected text, got {type(value).__name__}")
+            return ""
+        value = value.strip()
+        if required and not value:
+            self.error(name, "is required")
+        return value
+
+    def number(self, where: str, value: Any) -> float:
+        if isinstance(value, bool):
+            self.error(where, "expected a number, got bool")
+            return 0.0
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            self.error(where, f"expected a number, got {value!r}")
+            return 0.0
+        if number != number or number < 0:
+            self.error(where, "must be a non-negative number")
+            return 0.0
+        return number
+
+    def required_number(self, name: str) -> float:
+        value = self.record.get(name)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            self.error(name, "is required")
+            return 0.0
+        return self.number(name, value)
+
+    def date(self, where: str, value: Any) -> Optional[date]:
+        try:
+            return parse_date(value)
+        except (TypeError, ValueError):
+            self.error(where, f"expected a date like 2024-03 or 2024-03-15, got {value!r}")
+            return None
+
+    def revenue_model(self) -> Dict[str, float]:
+        value = self.raw("revenue_model")
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            self.error("revenue_model", "expected an object of stream -> share")
+            return {}
+        return {str(name): self.number(f"revenue_model.{name}", share) for name, share in value.items()}
+
+    def items(self, name: str) -> List[Any]:
+        value = self.raw(name)
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            self.error(name, "expected a list")
+            return []
+        return value
+
+    def roadmap(self) -> Tuple[Milestone, ...]:
+        milestones = []
+        for i, item in enumerate(self.items("roadmap")):
+            where = f"roadmap[{i}]"
+            if not isinstance(item, dict):
+                self.error(where, "expected an object")
+                continue
+            if not item.get("start_date"):
+                self.error(f"{where}.start_date", "is required")
+                continue
+            start = self.date(f"{where}.start_date", item["start_date"])
+            end = self.date(f"{where}.end_date", item["end_date"]) if item.get("end_date") else None
+            if start and end and end < start:
+                self.error(f"{where}.end_date", "is before start_date")
+            if start is None or (item.get("end_date") and end is None):
+                continue
+            lane = item.get("lane")
+            milestones.append(Milestone(milestone=str(item.get("milestone") or "Milestone").strip(),
+                                        start_date=start, end_date=end,
+                                        lane=str(lane) if lane else None))
+        return tuple(milestones)
+
+    def team(self) -> Tuple[TeamMember, ...]:
+        members = []
+        for i, item in enumerate(self.items("team")):
+            where = f"team[{i}]"
+            if not isinstance(item, dict):
+                self.error(where, "expected an object with name and role")
+                continue
+            missing = [key for key in ("name", "role")
+                       if not isinstance(item.get(key), str) or not item[key].strip()]
+            for key in missing:
+                self.error(f"{where}.{key}", "is required")
+            if not missing:
+                members.append(TeamMember(name=item["name"].strip(), role=item["role"].strip()))
+        return tuple(members)
+
+
+def validate_pitch_data(record: Mapping[str, Any]) -> PitchDeckData:
+    v = _Validator(record)
+    texts = {name: v.text(name, required=True) for name in REQUIRED_TEXT}
+    texts.update({name: v.text(name, required=False) for name in OPTIONAL_TEXT})
+    if texts["solution"] and len(texts["solution"]) < MIN_SOLUTION_LENGTH:
+        v.error("solution", f"needs at least {MIN_SOLUTION_LENGTH} characters to describe the product")
+    market_size = v.required_number("market_size")
+    revenue_model = v.revenue_model()
+    roadmap = v.roadmap()
+    team = v.team()
+    if v.errors:
+        raise PitchDataValidationError(v.errors)
+    return PitchDeckData(market_size=market_size, revenue_model=revenue_model,
+                         roadmap=roadmap, team=team, **texts)
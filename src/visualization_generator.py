@@ -1,9 +1,17 @@
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Sequence
+from instrumentation import traced
+from lazy import lazy_import
+from models import Milestone
+from roadmap import TimelinePage, paginate, parse_milestones
+
+# Loaded on first chart, not at import
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+
+PALETTE = ['#2962FF', '#00C853', '#546E7A', '#FF6D00', '#AA00FF']
 
 class VisualizationGenerator:
+    @traced("viz.create_market_size_chart")
     def create_market_size_chart(self, market_data):
         fig = go.Figure()
         fig.add_trace(go.Bar(
@@ -19,20 +27,55 @@ class VisualizationGenerator:
         )
         return fig
     
-    def create_revenue_projection(self, revenue_data: Dict[str, float]) -> go.Figure:
-        df = pd.DataFrame(list(revenue_data.items()), columns=['Stream', 'Revenue'])
-        fig = px.pie(df, values='Revenue', names='Stream',
-                     title='Revenue Distribution',
-                     color_discrete_sequence=['#2962FF', '#00C853'])
+    @traced("viz.create_revenue_projection")
+    def create_revenue_projection(self, revenue_data: Dict[str, float]) -> "go.Figure":
+        # Built directly from the dict; no DataFrame per call
+        colors = ['#2962FF', '#00C853']
+        fig = go.Figure(go.Pie(
+            labels=list(revenue_data.keys()),
+            values=list(revenue_data.values()),
+            marker=dict(colors=[colors[i % len(colors)] for i in range(len(revenue_data))])
+        ))
+        fig.update_layout(title_text='Revenue Distribution')
         return fig
     
-    def create_roadmap_timeline(self, milestones: List[Dict[str, Any]]) -> go.Figure:
-        df = pd.DataFrame(milestones)
-        fig = px.timeline(df, x_start='start_date', x_end='end_date',
-                         y='milestone', title='Product Roadmap',
-                         color_discrete_sequence=['#2962FF'])
+    @traced("viz.create_roadmap_timeline")
+    def create_roadmap_timeline(self, milestones: Sequence[Milestone]) -> "go.Figure":
+        return self.create_roadmap_timelines(milestones)[0]
+    
+    @traced("viz.create_roadmap_timelines")
+    def create_roadmap_timelines(self, milestones: Sequence[Milestone]) -> List["go.Figure"]:
+        # Milestones are sorted once; large roadmaps are split across
+        # pages or bucketed by quarter so every figure stays small
+        pages = paginate(parse_milestones(milestones))
+        return [self._timeline_figure(page, i + 1, len(pages)) for i, page in enumerate(pages)]
+    
+    def _timeline_figure(self, page: TimelinePage, number: int, total: int) -> "go.Figure":
+        # Horizontal bars on a date axis: a single trace per lane instead of
+        # px.timeline's DataFrame and per-row grouping
+        lanes = {}
+        for row in reversed(page.rows):
+            lanes.setdefault(row.lane, []).append(row)
+        fig = go.Figure()
+        for i, (lane, rows) in enumerate(lanes.items()):
+            fig.add_trace(go.Bar(
+                orientation='h',
+                y=[row.label for row in rows],
+                base=[row.start.isoformat() for row in rows],
+                x=[(row.end - row.start).days * 86_400_000 for row in rows],
+                text=[f"{row.count} milestones" if row.count > 1 else "" for row in rows],
+                name=lane or "Milestones",
+                marker_color=PALETTE[i % len(PALETTE)],
+                showlegend=lane is not None
+            ))
+        title = 'Product Roadmap'
+        if total > 1:
+            title += f' ({number}/{total})'
+        fig.update_layout(title_text=title, barmode='overlay', template='plotly_white')
+        fig.update_xaxes(type='date')
         return fig
     
+    @traced("viz.create_solution_diagram")
     def create_solution_diagram(self):
         fig = go.Figure(go.Indicator(
             mode="number+gauge",
@@ -43,9 +86,43 @@ class VisualizationGenerator:
         ))
         return fig
 
-    def create_financial_forecast(self):
-        years = [2024, 2025, 2026]
-        revenue = [1.2, 3.5, 8.0]  # In millions
-        fig = px.line(x=years, y=revenue, title="Revenue Projection (Millions USD)")
+    @traced("viz.create_financial_forecast")
+    def create_financial_forecast(self, years: Sequence[int] = (2024, 2025, 2026),
+                                  revenue: Sequence[float] = (1.2, 3.5, 8.0)):
+        # Revenue in millions
+        fig = px.line(x=list(years), y=list(revenue), title="Revenue Projection (Millions USD)")
         fig.update_traces(line_color='#2962FF')
-        return fig
\ No newline at end of file
+        return fig
+
+    @traced("viz.create_scenario_charts")
+    def create_scenario_charts(self, projection) -> Dict[str, "go.Figure"]:
+        # All sensitivity figures from one ScenarioProjection in a single pass
+        years = projection.years.tolist()
+        scenarios = go.Figure([
+            go.Scatter(x=years, y=row, mode='lines+markers', name=name,
+                       line=dict(color=PALETTE[i % len(PALETTE)]))
+            for i, (name, row) in enumerate(zip(projection.scenario_names,
+                                                projection.scenario_revenue.tolist()))
+        ])
+        scenarios.update_layout(title_text='Revenue Scenarios (Millions USD)', template='plotly_white')
+
+        sensitivity = go.Figure(go.Heatmap(
+            z=projection.sweep_revenue,
+            x=years,
+            y=[f"{cagr:.0%}" for cagr in projection.sweep_cagrs],
+            colorscale='Blues',
+            colorbar=dict(title='$M')
+        ))
+        sensitivity.update_layout(title_text='Revenue Sensitivity to CAGR',
+                                  yaxis_title='CAGR', template='plotly_white')
+
+        segments = projection.market_segments
+        market = go.Figure([
+            go.Bar(x=projection.split_names, y=segments[:, i], name=label,
+                   marker_color=PALETTE[i])
+            for i, label in enumerate(['TAM', 'SAM', 'SOM'])
+        ])
+        market.update_layout(title_text='Market Capture Scenarios', barmode='group',
+                             template='plotly_white')
+
+        return {"scenarios": scenarios, "sensitivity": sensitivity, "market_scenarios": market}
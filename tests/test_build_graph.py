@@ -0,0 +1,183 @@
+import dataclasses
+from concurrent.futures import Future
+
+import pytest
+
+from build_graph import BuildGraph
+from main_generator import PitchDeckGenerator
+from validation import validate_pitch_data
+
+PNG = b"\x89PNG stub"
+
+
+class ServiceUnavailableError(Exception):
+    pass
+
+
+def done_future(result=None, error=None) -> Future:
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class RecordingGraph(BuildGraph):
+    def __init__(self):
+        super().__init__()
+        self.rebuilt = set()
+
+    def build(self, node, pitch_data, builder, *extra):
+        def run():
+            self.rebuilt.add(node)
+            return builder()
+        return super().build(node, pitch_data, run, *extra)
+
+
+class FakeContent:
+    # Answers derive from the fields each prompt reads, so a changed field
+    # changes the text the slides are built from
+    def __init__(self):
+        self.calls = []
+        self.errors = {}
+        self.summaries = []
+        self.forgotten = 0
+
+    def _submit(self, node, text):
+        self.calls.append(node)
+        error = self.errors.pop(node, None)
+        return done_future(text, error)
+
+    def submit_elevator_pitch(self, pitch_data):
+        return self._submit("elevator_pitch", f"{pitch_data.company_name} picks faster")
+
+    def submit_executive_summary(self, pitch_data):
+        text = self.summaries.pop(0) if self.summaries else f"Summary: {pitch_data.traction}"
+        return self._submit("executive_summary", text)
+
+    def submit_elevator_pitch_stream(self, pitch_data, on_token):
+        return self._stream(self.submit_elevator_pitch(pitch_data), on_token)
+
+    def submit_executive_summary_stream(self, pitch_data, on_token):
+        return self._stream(self.submit_executive_summary(pitch_data), on_token)
+
+    @staticmethod
+    def _stream(future, on_token):
+        if future.exception() is None:
+            on_token(future.result())
+        return future
+
+    def forget_executive_summary(self, pitch_data):
+        self.forgotten += 1
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.submitted = []
+
+    def submit_many(self, figs, fmt="png"):
+        self.submitted.append(set(figs))
+        return {key: done_future(PNG) for key in figs}
+
+
+def make_pitch_data(**changes):
+    record = dict(
+        company_name="Acme Robotics",
+        problem_statement="Warehouses lose 20% of picking time to manual inventory lookups.",
+        solution="Autonomous picking robots that map shelves in real time and route "
+                 "orders through the fastest path in the warehouse.",
+        market_size=12_000_000_000,
+        revenue_model={"Hardware": 40, "Subscriptions": 60},
+        traction="Now 40 paying customers",
+        roadmap=[{"milestone": "Pilot", "start_date": "2024-01", "end_date": "2024-06"},
+                 {"milestone": "Launch", "start_date": "2024-07"}],
+        team=[{"name": "Ada", "role": "CEO"}, {"name": "Lin", "role": "CTO"}],
+    )
+    record.update(changes)
+    return validate_pitch_data(record)
+
+
+@pytest.fixture
+def generator():
+    generator = PitchDeckGenerator(content_generator=FakeContent())
+    generator.chart_renderer = FakeRenderer()
+    generator.build_graph = RecordingGraph()
+    return generator
+
+
+def rebuild(generator, pitch_data):
+    generator.build_graph.rebuilt.clear()
+    generator.chart_renderer.submitted.clear()
+    generator.build_deck_document(pitch_data)
+    return generator.build_graph.rebuilt
+
+
+def test_unchanged_data_rebuilds_nothing(generator):
+    pitch_data = make_pitch_data()
+    first = rebuild(generator, pitch_data)
+    assert {"elevator_pitch", "executive_summary", "chart.market", "slide.traction"} <= first
+    assert rebuild(generator, pitch_data) == set()
+    assert generator.content_generator.calls == ["elevator_pitch", "executive_summary"]
+    # Unchanged figures keep their render
+    assert generator.chart_renderer.submitted == [set()]
+
+
+def test_edited_field_rebuilds_only_its_dependents(generator):
+    pitch_data = make_pitch_data()
+    rebuild(generator, pitch_data)
+    edited = dataclasses.replace(pitch_data, traction="Now 55 paying customers")
+    assert rebuild(generator, edited) == {"executive_summary", "slide.traction",
+                                          "slide.executive_summary"}
+    assert generator.content_generator.calls[2:] == ["executive_summary"]
+    assert generator.chart_renderer.submitted == [set()]
+
+
+def test_edited_chart_input_renders_only_that_chart(generator):
+    pitch_data = make_pitch_data()
+    rebuild(generator, pitch_data)
+    charts_before = generator._build_charts(pitch_data)
+    edited = dataclasses.replace(pitch_data, revenue_model={"Hardware": 70, "Subscriptions": 30})
+    # The summary is asked for again but comes back the same, so its slide is kept
+    assert rebuild(generator, edited) == {"executive_summary", "chart.revenue",
+                                          "slide.business_model"}
+    assert generator.chart_renderer.submitted == [{"revenue"}]
+    charts_after = generator._build_charts(edited)
+    assert charts_after["revenue"] is not charts_before["revenue"]
+    assert charts_after["market"] is charts_before["market"]
+
+
+def test_failed_llm_call_is_not_reused(generator):
+    content = generator.content_generator
+    content.errors["executive_summary"] = ServiceUnavailableError("backend down")
+    pitch_data = make_pitch_data()
+    with pytest.raises(ServiceUnavailableError):
+        generator.build_deck_document(pitch_data)
+    assert not generator.build_graph.is_current("executive_summary", pitch_data)
+    assert generator.build_graph.is_current("elevator_pitch", pitch_data)
+
+    rebuilt = rebuild(generator, pitch_data)
+    assert "executive_summary" in rebuilt and "elevator_pitch" not in rebuilt
+    assert content.calls == ["elevator_pitch", "executive_summary", "executive_summary"]
+
+
+def test_placeholder_summary_is_discarded(generator):
+    content = generator.content_generator
+    content.summaries.append("Summary [**Specify the market**]")
+    pitch_data = make_pitch_data()
+    with pytest.raises(ValueError):
+        generator.build_deck_document(pitch_data)
+    assert not generator.build_graph.is_current("executive_summary", pitch_data)
+    assert content.forgotten == 1
+
+    generator.build_deck_document(pitch_data)
+    assert content.calls.count("executive_summary") == 2
+
+
+def test_streamed_rerun_replays_memoized_text(generator):
+    pitch_data = make_pitch_data()
+    rebuild(generator, pitch_data)
+    events = list(generator.iter_generate_pitch_deck(pitch_data))
+    tokens = [event.text for event in events if event.stage == "summary_token"]
+    assert tokens == ["Summary: Now 40 paying customers"]
+    assert generator.content_generator.calls == ["elevator_pitch", "executive_summary"]
@@ -0,0 +1,180 @@
+import time
+
+import pytest
+
+from llm_scheduler import (CircuitBreaker, CircuitOpenError, LLMCallError, LLMScheduler,
+                           LLMTimeoutError, TokenBucket)
+
+
+class ServiceUnavailableError(Exception):
+    pass
+
+
+class Backend:
+    def __init__(self):
+        self.up = True
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if not self.up:
+            raise ServiceUnavailableError("backend down")
+        return "ok"
+
+    def stream(self):
+        self.calls += 1
+        if not self.up:
+            raise ServiceUnavailableError("backend down")
+        yield "a"
+        yield "b"
+
+
+def make_scheduler(**kwargs):
+    kwargs.setdefault("deadline", 1.0)
+    kwargs.setdefault("max_retries", 0)
+    kwargs.setdefault("backoff_base", 0.01)
+    return LLMScheduler(**kwargs)
+
+
+def test_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(threshold=2, reset_timeout=0.1)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    time.sleep(0.15)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    # Only one trial call while half-open
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.1)
+    breaker.record_failure()
+    time.sleep(0.15)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_rate_limit_timeout_does_not_strand_half_open_breaker():
+    backend = Backend()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.2)
+    scheduler = make_scheduler(rate_limiter=TokenBucket(rate=1, capacity=1), breaker=breaker)
+    try:
+        backend.up = False
+        with pytest.raises(LLMCallError):
+            scheduler.call("pitch", backend)
+        assert breaker.state == "open"
+
+        # Reset timeout passed but the bucket is empty: the call gives up
+        # waiting for a token without taking the half-open trial
+        time.sleep(0.25)
+        scheduler.deadline = 0.1
+        with pytest.raises(LLMTimeoutError):
+            scheduler.call("pitch", backend)
+        assert breaker.state == "open"
+
+        backend.up = True
+        scheduler.deadline = 1.0
+        for _ in range(3):
+            time.sleep(1.2)
+            assert scheduler.call("pitch", backend) == "ok"
+        assert breaker.state == "closed"
+    finally:
+        scheduler.shutdown()
+
+
+def test_open_breaker_short_circuits():
+    backend = Backend()
+    backend.up = False
+    scheduler = make_scheduler(breaker=CircuitBreaker(threshold=1, reset_timeout=60))
+    try:
+        with pytest.raises(LLMCallError):
+            scheduler.call("pitch", backend)
+        with pytest.raises(CircuitOpenError):
+            scheduler.call("pitch", backend)
+        assert backend.calls == 1
+        assert scheduler.stats.short_circuits == 1
+    finally:
+        scheduler.shutdown()
+
+
+def test_closed_stream_ends_half_open_trial():
+    backend = Backend()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.1)
+    scheduler = make_scheduler(breaker=breaker)
+    try:
+        breaker.record_failure()
+        time.sleep(0.15)
+        chunks = scheduler.stream("pitch", backend.stream)
+        assert next(chunks) == "a"
+        assert breaker.state == "half_open"
+        chunks.close()
+        assert breaker.state == "closed"
+        assert list(scheduler.stream("pitch", backend.stream)) == ["a", "b"]
+    finally:
+        scheduler.shutdown()
+
+
+def test_transient_errors_are_retried():
+    outcomes = iter([ServiceUnavailableError("busy"), "ok"])
+
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    scheduler = make_scheduler(max_retries=2)
+    try:
+        assert scheduler.call("pitch", flaky) == "ok"
+        assert scheduler.stats.retries == 1
+    finally:
+        scheduler.shutdown()
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+def test_client_errors_do_not_open_breaker():
+    def bad_request():
+        raise BadRequestError("prompt rejected")
+
+    breaker = CircuitBreaker(threshold=2, reset_timeout=60)
+    scheduler = make_scheduler(max_retries=2, breaker=breaker)
+    try:
+        for _ in range(5):
+            with pytest.raises(LLMCallError):
+                scheduler.call("pitch", bad_request)
+        assert breaker.state == "closed"
+        assert scheduler.stats.retries == 0
+    finally:
+        scheduler.shutdown()
+
+
+def test_client_error_ends_half_open_trial():
+    def bad_request():
+        raise BadRequestError("prompt rejected")
+
+    backend = Backend()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.1)
+    scheduler = make_scheduler(breaker=breaker)
+    try:
+        breaker.record_failure()
+        time.sleep(0.15)
+        with pytest.raises(LLMCallError):
+            scheduler.call("pitch", bad_request)
+        assert breaker.state == "open"
+        # The trial goes to the next call straight away, without a new reset wait
+        assert scheduler.call("pitch", backend) == "ok"
+        assert breaker.state == "closed"
+    finally:
+        scheduler.shutdown()